@@ -18,6 +18,7 @@ class Settings:
     COBALT_API_AUTH_TOKEN: str
     COBALT_API_TIMEOUT: float
     COBALT_API_BASE_URL_FALLBACK: bool
+    COBALT_MAX_CONCURRENT_DOWNLOADS: int
 
     def __init__(self):
         self.API_KEY = os.getenv("API_KEY", "")
@@ -38,6 +39,7 @@ class Settings:
         self.COBALT_API_AUTH_SCHEME = os.getenv("COBALT_API_AUTH_SCHEME", "")
         self.COBALT_API_AUTH_TOKEN = os.getenv("COBALT_API_AUTH_TOKEN", "")
         self.COBALT_API_TIMEOUT = float(os.getenv("COBALT_API_TIMEOUT", "60"))
+        self.COBALT_MAX_CONCURRENT_DOWNLOADS = max(1, int(os.getenv("COBALT_MAX_CONCURRENT_DOWNLOADS", "2")))
 
 
 settings = Settings()
@@ -15,6 +15,10 @@ import threading
 import uuid
 
 
+# Job id of the sentinel pushed by ``wake_consumer`` so a blocked ``dequeue`` returns.
+STOP_JOB_ID = "__stop__"
+
+
 class LocalQueuePayload(BaseModel):
     """Payload accepted by the local queue enqueue endpoint."""
 
@@ -55,6 +59,10 @@ class LocalQueueExtension:
     def task_done(self) -> None:
         self._queue.task_done()
 
+    def wake_consumer(self) -> None:
+        """Unblock one ``dequeue`` call by queueing a stop sentinel."""
+        self._queue.put({"id": STOP_JOB_ID})
+
     def set_started(self, job_id: str) -> None:
         self._write_job(job_id, {"status": "started"})
 
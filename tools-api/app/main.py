@@ -5,6 +5,7 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
@@ -16,6 +17,7 @@ from app.extensions import local_queue_extension
 from app.routers import docx, ffmpeg, gdocs_parser, image_tools, js_tools, media, parser
 from app.services.cobalt_gateway import CobaltError, create_gateway
 from app.services.cobalt_shortcuts import list_shortcuts
+from app.services.ffmpeg_service import FfmpegServiceError, ffmpeg_service
 from app.utils.logger import logger
 
 
@@ -190,6 +192,15 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+async def _warm_ffmpeg_formats() -> None:
+    """Populate the FFmpeg format cache so the first request skips the probe."""
+
+    try:
+        await run_in_threadpool(ffmpeg_service.list_formats)
+    except FfmpegServiceError as exc:
+        logger.warning("FFmpeg format probe skipped at startup: %s", exc)
+
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
@@ -198,12 +209,16 @@ async def startup_event():
     logger.info("🚀 Tools API starting up...")
     logger.info(f"Environment: {settings.ENVIRONMENT if hasattr(settings, 'ENVIRONMENT') else 'production'}")
     logger.info(f"CORS enabled for all origins")
+    await _warm_ffmpeg_formats()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown."""
     _restore_asyncio_exception_handler()
+    gateway = getattr(js_tools, "_cobalt_gateway", None)
+    if gateway is not None:
+        await gateway.aclose()
     logger.info("🛑 Tools API shutting down...")
 
 
@@ -269,6 +284,7 @@ def _build_studio_context(request: Request) -> dict:
                 auth_scheme=settings.COBALT_API_AUTH_SCHEME,
                 auth_token=settings.COBALT_API_AUTH_TOKEN,
                 timeout=settings.COBALT_API_TIMEOUT,
+                max_local_downloads=settings.COBALT_MAX_CONCURRENT_DOWNLOADS,
             )
             js_tools._cobalt_gateway = gateway
         except CobaltError:
@@ -4,12 +4,13 @@ from typing import Any, Dict, Literal
 from urllib.parse import quote
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, Query, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field
+from starlette.background import BackgroundTask
 
 from app.config import settings
 from app.services.cobalt_gateway import CobaltGateway, create_gateway
-from app.services.cobalt_service import CobaltError
+from app.services.cobalt_service import CobaltBinaryResult, CobaltError
 from app.services.cobalt_shortcuts import SHORTCUT_REGISTRY
 from app.services.js_tool_service import JavaScriptToolError, run_panosplitter
 from app.utils.logger import logger
@@ -76,6 +77,21 @@ def _content_disposition(filename: str) -> str:
     return f"attachment; filename*=UTF-8''{encoded}"
 
 
+def _binary_response(binary: CobaltBinaryResult, headers: Dict[str, str]) -> Response:
+    # Downloads are already on disk, so serve them from there rather than memory and
+    # drop the temporary file once it has been sent.
+    if binary.path is not None:
+        return FileResponse(
+            binary.path,
+            media_type=binary.content_type,
+            headers=headers,
+            background=BackgroundTask(binary.release),
+        )
+    content = binary.read_bytes()
+    binary.release()
+    return Response(content=content, media_type=binary.content_type, headers=headers)
+
+
 _cobalt_gateway: CobaltGateway | None = None
 
 
@@ -88,6 +104,7 @@ def _get_cobalt_service() -> CobaltGateway:
                 auth_scheme=settings.COBALT_API_AUTH_SCHEME,
                 auth_token=settings.COBALT_API_AUTH_TOKEN,
                 timeout=settings.COBALT_API_TIMEOUT,
+                max_local_downloads=settings.COBALT_MAX_CONCURRENT_DOWNLOADS,
             )
         except CobaltError as exc:
             raise HTTPException(status_code=503, detail=str(exc)) from exc
@@ -214,7 +231,7 @@ async def cobalt_endpoint(request: CobaltRequest):
                     "X-Cobalt-Metadata": binary.encoded_metadata,
                 }
             )
-            return Response(content=binary.content, media_type=binary.content_type, headers=headers)
+            return _binary_response(binary, headers)
 
         return JSONResponse(content=result.payload, headers=headers)
     except CobaltError as exc:
@@ -267,7 +284,7 @@ async def cobalt_shortcut(shortcut: str, request: CobaltShortcutRequest):
                     "X-Cobalt-Metadata": binary.encoded_metadata,
                 }
             )
-            return Response(content=binary.content, media_type=binary.content_type, headers=headers)
+            return _binary_response(binary, headers)
 
         body: Dict[str, Any] = {
             "shortcut": shortcut_config.slug,
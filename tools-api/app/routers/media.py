@@ -360,10 +360,12 @@ async def _handle_download(request: YtDlpRequest, url: str, options: Dict[str, A
         if progress_job_id:
             progress_manager.close(progress_job_id)
 
-    download.metadata = download.metadata or {}
-    download.metadata.setdefault("mode", mode.value)
+    with download:
+        download.metadata = download.metadata or {}
+        download.metadata.setdefault("mode", mode.value)
 
-    stored = _persist_download(download)
+        # Moving (or, across filesystems, copying) hundreds of MB must not stall the event loop.
+        stored = await run_in_threadpool(_persist_download, download)
     return _build_download_response(stored, download.metadata, http_request)
 
 
@@ -371,10 +373,10 @@ def _persist_download(download: DownloadResult) -> StoredDownload:
     metadata = dict(jsonable_encoder(download.metadata or {}))
     metadata.setdefault("filename", download.filename)
     metadata.setdefault("content_type", download.content_type)
-    metadata.setdefault("filesize", len(download.content))
-    stored = download_store.store(
+    metadata.setdefault("filesize", download.size)
+    stored = download_store.store_file(
         filename=download.filename,
-        content=download.content,
+        source=download.path,
         content_type=download.content_type,
         metadata=metadata,
     )
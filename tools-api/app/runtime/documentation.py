@@ -16,6 +16,8 @@ except Exception:  # pragma: no cover - fallback if PyYAML is missing
 
 CATALOG_PATH = Path(__file__).resolve().parents[2] / "docs" / "service_catalog.yaml"
 
+_SENTENCE_ENDERS = frozenset(".!?")
+
 
 def _pretty_json(data: Any) -> str:
     """Return JSON formatted text for examples."""
@@ -134,10 +136,10 @@ def _fields_as_sentences(fields: Optional[Dict[str, str]]) -> List[str]:
         return []
     sentences: List[str] = []
     for name, description in fields.items():
-        desc = str(description).strip()
+        desc = description.strip() if isinstance(description, str) else str(description).strip()
         if not desc:
             desc = "No description provided."
-        if not desc.endswith(('.', '!', '?')):
+        elif desc[-1] not in _SENTENCE_ENDERS:
             desc = f"{desc}."
         sentences.append(f"{name}: {desc}")
     return sentences
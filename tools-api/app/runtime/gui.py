@@ -5,7 +5,8 @@ import json
 import threading
 import webbrowser
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import httpx
 
@@ -33,10 +34,72 @@ if ttkb is not None:
 else:
     ttk = _ttk
 
+_SENTENCE_ENDERS = frozenset(".!?")
+
+
+FieldPairs = Tuple[Tuple[str, str], ...]
+
+
+def _freeze_fields(fields: Optional[Dict[str, Any]]) -> FieldPairs:
+    """Return documented fields as a hashable tuple, preserving catalog order."""
+    if not isinstance(fields, dict):
+        return ()
+    return tuple(
+        (str(name), description if isinstance(description, str) else str(description))
+        for name, description in fields.items()
+    )
+
+
+def _format_fields(fields: FieldPairs) -> List[str]:
+    entries = []
+    for name, description in fields:
+        text = description.strip()
+        if text[-1:] not in _SENTENCE_ENDERS:
+            text += '.'
+        entries.append(f"{name}: {text}")
+    return entries
+
+
+@lru_cache(maxsize=256)
+def _format_endpoint_card(request_fields: FieldPairs, response_fields: FieldPairs, notes: Tuple[str, ...]) -> str:
+    """Build the details text shown on an endpoint card; cached across refreshes."""
+    detail_lines: List[str] = []
+
+    request_lines = _format_fields(request_fields)
+    if request_lines:
+        detail_lines.append("📤 Send:")
+        detail_lines.extend([f"  • {field}" for field in request_lines])
+    else:
+        detail_lines.append("📤 Send: No request body documented.")
+
+    response_lines = _format_fields(response_fields)
+    if response_lines:
+        detail_lines.append("\n📥 Receive:")
+        detail_lines.extend([f"  • {field}" for field in response_lines])
+    else:
+        detail_lines.append("\n📥 Receive: No structured response documented.")
+
+    for note in notes:
+        detail_lines.append(f"\n💡 Note: {note}")
+
+    return "\n".join(detail_lines)
+
 
 class ControlCenterUI:
     """Encapsulate the Tkinter-based desktop UI with modern aesthetics."""
 
+    # Attribute access on the log/scroll hot paths goes through slots instead of a __dict__
+    __slots__ = (
+        "_host", "_port", "_base_url", "_thread", "_root", "_after", "_cards_canvas",
+        "_cards_frame", "_cards_scroller", "_cards_window_id", "_cards_error_label",
+        "_section_widgets", "_card_widgets", "_card_pool", "_mini_text", "_mini_content_frame",
+        "_mini_arrow", "_mini_collapsed", "_hero_content_frame", "_hero_arrow", "_hero_collapsed",
+        "_hero_container", "_log_text", "_health_label", "_health_time_label", "_health_status",
+        "_health_indicator", "_toast_var", "_toast_label", "_toast_container", "_toast_after",
+        "_log_callback", "_doc_window", "_scrollregion_scheduled", "_pending_canvas_width",
+        "_pending_wheel_delta", "_wheel_flush_scheduled", "_use_bootstrap", "_supported",
+    )
+
     # Modern color palette with vibrant accents and depth
     COLORS = {
         "bg": "#0a0e1a",
@@ -90,11 +153,17 @@ class ControlCenterUI:
         self._cards_canvas: Optional["tk.Canvas"] = None
         self._cards_frame: Optional["ttk.Frame"] = None
         self._cards_scroller: Optional["ScrolledFrame"] = None
+        self._cards_window_id: Optional[int] = None
+        self._cards_error_label: Optional["tk.Label"] = None
+        self._section_widgets: Dict[str, tuple] = {}
+        self._card_widgets: Dict[str, Dict[str, Any]] = {}
+        self._card_pool: List[Dict[str, Any]] = []
         self._mini_text: Optional["tk.Text"] = None
         self._mini_content_frame: Optional["tk.Frame"] = None
         self._mini_arrow: Optional["tk.Label"] = None
         self._mini_collapsed: bool = False
         self._hero_content_frame: Optional["tk.Frame"] = None
+        self._hero_arrow: Optional["tk.Label"] = None
         self._hero_collapsed: bool = False
         self._hero_container: Optional["tk.Frame"] = None
         self._log_text: Optional["tk.Text"] = None
@@ -108,8 +177,16 @@ class ControlCenterUI:
         self._toast_label: Optional["ttk.Label"] = None
         self._toast_container: Optional["tk.Frame"] = None
         self._toast_after: Optional[str] = None
-        self._log_callback: Optional[Callable[[str], None]] = None
+        self._log_callback: Optional[Callable[[List[bytes]], None]] = None
         self._doc_window: Optional["tk.Toplevel"] = None
+        # Bound to ``root.after(0, ...)`` while the Tk loop runs so _schedule stays branch-free
+        self._after: Callable[[Callable[[], None]], None] = self._discard_callback
+
+        # Debounce state for scroll/resize storms on the canvas fallback
+        self._scrollregion_scheduled: bool = False
+        self._pending_canvas_width: Optional[int] = None
+        self._pending_wheel_delta: int = 0
+        self._wheel_flush_scheduled: bool = False
 
         # Feature flags
         self._use_bootstrap = ttkb is not None and Window is not None and ttk is not None and tk is not None
@@ -161,6 +238,7 @@ class ControlCenterUI:
                 pass
 
         self._root = root
+        self._after = lambda callback: root.after(0, callback)
         if tk is not None:
             try:
                 self._toast_var = tk.StringVar(master=root, value="")
@@ -465,15 +543,14 @@ class ControlCenterUI:
 
             inner_frame = ttk.Frame(canvas, style="CardContainer.TFrame")
             window_id = canvas.create_window((0, 0), window=inner_frame, anchor="nw")
-            inner_frame.bind("<Configure>",
-                lambda event: canvas.configure(scrollregion=canvas.bbox("all")))
-            canvas.bind("<Configure>",
-                lambda event: canvas.itemconfigure(window_id, width=event.width))
+            inner_frame.bind("<Configure>", lambda event: self._queue_scrollregion())
+            canvas.bind("<Configure>", lambda event: self._queue_canvas_width(event.width))
             canvas.bind("<MouseWheel>", self._on_mousewheel)
             canvas.bind("<Button-4>", lambda event: self._scroll_canvas(-1))
             canvas.bind("<Button-5>", lambda event: self._scroll_canvas(1))
 
             self._cards_canvas = canvas
+            self._cards_window_id = window_id
             self._cards_frame = inner_frame
             self._cards_scroller = None
 
@@ -710,12 +787,50 @@ class ControlCenterUI:
         elif getattr(event, "num", None) in (4, 5):
             delta = -1 if event.num == 4 else 1
         if delta:
-            self._cards_canvas.yview_scroll(delta, "units")
+            self._scroll_canvas(delta)
 
     def _scroll_canvas(self, delta: int) -> None:
-        if self._cards_canvas:
+        """Accumulate wheel ticks and apply them in a single idle-time scroll."""
+        if self._cards_canvas is None or self._root is None:
+            return
+        self._pending_wheel_delta += delta
+        if not self._wheel_flush_scheduled:
+            self._wheel_flush_scheduled = True
+            self._root.after_idle(self._flush_wheel_delta)
+
+    def _flush_wheel_delta(self) -> None:
+        self._wheel_flush_scheduled = False
+        delta, self._pending_wheel_delta = self._pending_wheel_delta, 0
+        if delta and self._cards_canvas is not None:
             self._cards_canvas.yview_scroll(delta, "units")
 
+    def _queue_scrollregion(self) -> None:
+        """Coalesce inner-frame resizes into one scrollregion update per idle cycle."""
+        if self._scrollregion_scheduled or self._root is None:
+            return
+        self._scrollregion_scheduled = True
+        self._root.after_idle(self._apply_scrollregion)
+
+    def _apply_scrollregion(self) -> None:
+        self._scrollregion_scheduled = False
+        if self._cards_canvas is not None:
+            self._cards_canvas.configure(scrollregion=self._cards_canvas.bbox("all"))
+
+    def _queue_canvas_width(self, width: int) -> None:
+        """Track the latest canvas width and resize the card window once it settles."""
+        if self._root is None:
+            return
+        already_scheduled = self._pending_canvas_width is not None
+        self._pending_canvas_width = width
+        if not already_scheduled:
+            self._root.after_idle(self._apply_canvas_width)
+
+    def _apply_canvas_width(self) -> None:
+        width, self._pending_canvas_width = self._pending_canvas_width, None
+        if width is None or self._cards_canvas is None or self._cards_window_id is None:
+            return
+        self._cards_canvas.itemconfigure(self._cards_window_id, width=width)
+
     def _focus_window(self) -> None:
         if self._root is None:
             return
@@ -763,157 +878,216 @@ class ControlCenterUI:
             self._mini_content_frame.pack(fill="both", expand=True, pady=(2, 0))
 
     def _populate_service_cards(self) -> None:
+        """Render service cards, reusing pooled widgets instead of rebuilding the tree."""
         if self._cards_frame is None:
             return
 
-        for child in self._cards_frame.winfo_children():
-            child.destroy()
-
         services, error = get_service_details()
+
+        for header, summary_label in self._section_widgets.values():
+            header.pack_forget()
+            summary_label.pack_forget()
+        if self._cards_error_label is not None:
+            self._cards_error_label.pack_forget()
+
         if error:
-            error_label = tk.Label(self._cards_frame,
-                text=f"⚠️ {error}",
-                bg=self.COLORS["panel"],
-                fg=self.COLORS["error"],
-                font=("SF Pro Text", 12),
-                wraplength=800,
-                justify="left")
-            error_label.pack(fill="x", pady=16)
+            for endpoint_id in list(self._card_widgets):
+                self._release_card(endpoint_id)
+            if self._cards_error_label is None:
+                self._cards_error_label = tk.Label(self._cards_frame,
+                    bg=self.COLORS["panel"],
+                    fg=self.COLORS["error"],
+                    font=("SF Pro Text", 12),
+                    wraplength=800,
+                    justify="left")
+            self._cards_error_label.configure(text=f"⚠️ {error}")
+            self._cards_error_label.pack(fill="x", pady=16)
             return
 
-        for service in services:
-            section = tk.Frame(self._cards_frame, bg=self.COLORS["panel"])
-            section.pack(fill="x", expand=True, pady=(0, 24))
+        # Catalog order lives in ``layout``; ``active_ids`` only answers membership checks.
+        active_ids: Set[str] = set()
+        layout: List[tuple] = []
+        for index, service in enumerate(services):
+            name = service.get("name", "Service")
+            header, summary_label = self._get_section_widgets(name)
+            header.configure(text=f"🔧 {name}")
+            summary_label.configure(text=service.get("summary") or "")
+            layout.append(("section", index, header, summary_label, bool(service.get("summary"))))
 
-            # Service heading with icon
-            service_header = tk.Label(section,
-                text=f"🔧 {service.get('name', 'Service')}",
+            for endpoint in service.get("endpoints", []):
+                endpoint_id = f"{name}::{endpoint.get('method', 'GET')} {endpoint.get('path', '/')}"
+                if endpoint_id in active_ids:
+                    continue
+                active_ids.add(endpoint_id)
+                layout.append(("card", endpoint_id, endpoint))
+
+        for endpoint_id in [key for key in self._card_widgets if key not in active_ids]:
+            self._release_card(endpoint_id)
+
+        # Re-pack in catalog order so pooled widgets land in the right slots.
+        for entry in layout:
+            if entry[0] == "section":
+                _, index, header, summary_label, has_summary = entry
+                header.pack(fill="x", pady=(0 if index == 0 else 24, 8))
+                if has_summary:
+                    summary_label.pack(fill="x", pady=(0, 16))
+                continue
+
+            _, endpoint_id, endpoint = entry
+            widgets = self._card_widgets.get(endpoint_id)
+            if widgets is None:
+                widgets = self._card_pool.pop() if self._card_pool else self._create_card_widgets()
+                self._card_widgets[endpoint_id] = widgets
+            self._update_card_widgets(widgets, endpoint)
+            widgets["border"].pack_forget()
+            widgets["border"].pack(fill="x", expand=True, pady=14)
+
+    def _get_section_widgets(self, name: str) -> tuple:
+        section = self._section_widgets.get(name)
+        if section is None:
+            header = tk.Label(self._cards_frame,
                 bg=self.COLORS["panel"],
                 fg=self.COLORS["text"],
                 font=("SF Pro Display", 17, "bold"),
                 anchor="w")
-            service_header.pack(fill="x", pady=(0, 8))
+            summary_label = tk.Label(self._cards_frame,
+                bg=self.COLORS["panel"],
+                fg=self.COLORS["muted"],
+                font=("SF Pro Text", 11),
+                wraplength=900,
+                justify="left")
+            section = (header, summary_label)
+            self._section_widgets[name] = section
+        return section
 
-            summary = service.get("summary")
-            if summary:
-                summary_label = tk.Label(section,
-                    text=summary,
-                    bg=self.COLORS["panel"],
-                    fg=self.COLORS["muted"],
-                    font=("SF Pro Text", 11),
-                    wraplength=900,
-                    justify="left")
-                summary_label.pack(fill="x", pady=(0, 16))
+    def _release_card(self, endpoint_id: str) -> None:
+        widgets = self._card_widgets.pop(endpoint_id, None)
+        if widgets is None:
+            return
+        widgets["border"].pack_forget()
+        self._card_pool.append(widgets)
 
-            for endpoint in service.get("endpoints", []):
-                # Modern card with shadow effect (simulated with border)
-                card_border = tk.Frame(section, 
-                    bg=self.COLORS["card_border"], 
-                    padx=1, 
-                    pady=1)
-                card_border.pack(fill="x", expand=True, pady=14)
-                
-                card = tk.Frame(card_border, 
-                    bg=self.COLORS["card"], 
-                    padx=28,
-                    pady=24)
-                card.pack(fill="x", expand=True)
-
-                # Card title
-                title_label = tk.Label(card,
-                    text=endpoint["headline"],
-                    bg=self.COLORS["card"],
-                    fg=self.COLORS["accent_glow"],
-                    font=("SF Pro Display", 15, "bold"),
-                    anchor="w")
-                title_label.pack(anchor="w")
-
-                # Method and path row
-                meta_row = tk.Frame(card, bg=self.COLORS["card"])
-                meta_row.pack(fill="x", pady=(10, 14))
-                
-                badge = self._create_method_badge(meta_row, endpoint.get("method", "GET"))
-                if badge:
-                    badge.pack(side="left")
-                
-                path_label = tk.Label(meta_row,
-                    text=endpoint.get("path", "/"),
-                    bg=self.COLORS["card"],
-                    fg=self.COLORS["text"],
-                    font=("SF Mono", 11))
-                path_label.pack(side="left", padx=(14, 0))
-                
-                content_type = endpoint.get("request", {}).get("content_type")
-                if content_type:
-                    ct_label = tk.Label(meta_row,
-                        text=f"• {content_type}",
-                        bg=self.COLORS["card"],
-                        fg=self.COLORS["dim"],
-                        font=("SF Mono", 10))
-                    ct_label.pack(side="left", padx=(18, 0))
-
-                # Tagline
-                tagline = endpoint.get("tagline")
-                if tagline:
-                    tagline_label = tk.Label(card,
-                        text=tagline,
-                        bg=self.COLORS["card"],
-                        fg=self.COLORS["muted"],
-                        font=("SF Pro Text", 11),
-                        wraplength=900,
-                        justify="left")
-                    tagline_label.pack(anchor="w", pady=(0, 12))
-
-                # Details section
-                detail_lines: List[str] = []
-
-                request_fields = self._format_fields(endpoint.get("request", {}).get("fields"))
-                if request_fields:
-                    detail_lines.append("📤 Send:")
-                    detail_lines.extend([f"  • {field}" for field in request_fields])
-                else:
-                    detail_lines.append("📤 Send: No request body documented.")
+    def _create_card_widgets(self) -> Dict[str, Any]:
+        # Modern card with shadow effect (simulated with border)
+        card_border = tk.Frame(self._cards_frame,
+            bg=self.COLORS["card_border"],
+            padx=1,
+            pady=1)
 
-                response_fields = self._format_fields(endpoint.get("response", {}).get("fields"))
-                if response_fields:
-                    detail_lines.append("\n📥 Receive:")
-                    detail_lines.extend([f"  • {field}" for field in response_fields])
-                else:
-                    detail_lines.append("\n📥 Receive: No structured response documented.")
-
-                for note in endpoint.get("notes", []):
-                    detail_lines.append(f"\n💡 Note: {note}")
-
-                details_label = tk.Label(card,
-                    text="\n".join(detail_lines),
-                    bg=self.COLORS["card"],
-                    fg=self.COLORS["text"],
-                    font=("SF Pro Text", 11),
-                    justify="left",
-                    wraplength=900)
-                details_label.pack(anchor="w", pady=(0, 18))
-
-                # Action buttons
-                action_row = tk.Frame(card, bg=self.COLORS["card"])
-                action_row.pack(fill="x")
-                
-                # Use a wrapper to properly capture the endpoint
-                def make_copy_handler(ep):
-                    return lambda: self._copy_curl_command(ep)
-                
-                self._create_button(action_row, 
-                    "📋 Copy cURL", 
-                    make_copy_handler(endpoint), 
-                    primary=True).pack(side="left")
-                
-                action_hint = tk.Label(action_row,
-                    text="Includes base URL and example payload",
-                    bg=self.COLORS["card"],
-                    fg=self.COLORS["dim"],
-                    font=("SF Pro Text", 10),
-                    wraplength=600,
-                    justify="left")
-                action_hint.pack(side="left", padx=(18, 0))
+        card = tk.Frame(card_border,
+            bg=self.COLORS["card"],
+            padx=28,
+            pady=24)
+        card.pack(fill="x", expand=True)
+
+        # Card title
+        title_label = tk.Label(card,
+            bg=self.COLORS["card"],
+            fg=self.COLORS["accent_glow"],
+            font=("SF Pro Display", 15, "bold"),
+            anchor="w")
+        title_label.pack(anchor="w")
+
+        # Method and path row
+        meta_row = tk.Frame(card, bg=self.COLORS["card"])
+        meta_row.pack(fill="x", pady=(10, 14))
+
+        badge = self._create_method_badge(meta_row, "GET")
+        badge.pack(side="left")
+
+        path_label = tk.Label(meta_row,
+            bg=self.COLORS["card"],
+            fg=self.COLORS["text"],
+            font=("SF Mono", 11))
+        path_label.pack(side="left", padx=(14, 0))
+
+        ct_label = tk.Label(meta_row,
+            bg=self.COLORS["card"],
+            fg=self.COLORS["dim"],
+            font=("SF Mono", 10))
+
+        # Tagline
+        tagline_label = tk.Label(card,
+            bg=self.COLORS["card"],
+            fg=self.COLORS["muted"],
+            font=("SF Pro Text", 11),
+            wraplength=900,
+            justify="left")
+
+        # Details section
+        details_label = tk.Label(card,
+            bg=self.COLORS["card"],
+            fg=self.COLORS["text"],
+            font=("SF Pro Text", 11),
+            justify="left",
+            wraplength=900)
+        details_label.pack(anchor="w", pady=(0, 18))
+
+        # Action buttons
+        action_row = tk.Frame(card, bg=self.COLORS["card"])
+        action_row.pack(fill="x")
+
+        copy_button = self._create_button(action_row, "📋 Copy cURL", lambda: None, primary=True)
+        copy_button.pack(side="left")
+
+        action_hint = tk.Label(action_row,
+            text="Includes base URL and example payload",
+            bg=self.COLORS["card"],
+            fg=self.COLORS["dim"],
+            font=("SF Pro Text", 10),
+            wraplength=600,
+            justify="left")
+        action_hint.pack(side="left", padx=(18, 0))
+
+        return {
+            "border": card_border,
+            "title": title_label,
+            "badge": badge,
+            "path": path_label,
+            "content_type": ct_label,
+            "tagline": tagline_label,
+            "details": details_label,
+            "copy": copy_button,
+        }
+
+    def _update_card_widgets(self, widgets: Dict[str, Any], endpoint: Dict[str, Any]) -> None:
+        widgets["title"].configure(text=endpoint["headline"])
+        self._update_method_badge(widgets["badge"], endpoint.get("method", "GET"))
+        widgets["path"].configure(text=endpoint.get("path", "/"))
+
+        content_type = endpoint.get("request", {}).get("content_type")
+        if content_type:
+            widgets["content_type"].configure(text=f"• {content_type}")
+            widgets["content_type"].pack(side="left", padx=(18, 0))
+        else:
+            widgets["content_type"].pack_forget()
+
+        tagline = endpoint.get("tagline")
+        if tagline:
+            widgets["tagline"].configure(text=tagline)
+            widgets["tagline"].pack(anchor="w", pady=(0, 12), before=widgets["details"])
+        else:
+            widgets["tagline"].pack_forget()
+
+        widgets["details"].configure(text=self._card_details_text(endpoint))
+
+        # Bind through a default argument so each card captures its own endpoint
+        widgets["copy"].configure(command=lambda ep=endpoint: self._copy_curl_command(ep))
+
+    def _update_method_badge(self, badge: "tk.Widget", method: str) -> None:
+        method_upper = method.upper()
+        if self._use_bootstrap:
+            badge.configure(text=method_upper, bootstyle=f"{self._method_bootstyle(method_upper)}-INVERSE")
+            return
+        badge.configure(text=method_upper, bg=self.METHOD_COLORS.get(method_upper, self.COLORS["badge"]))
+
+    def _card_details_text(self, endpoint: Dict[str, Any]) -> str:
+        notes = endpoint.get("notes", [])
+        return _format_endpoint_card(
+            _freeze_fields(endpoint.get("request", {}).get("fields")),
+            _freeze_fields(endpoint.get("response", {}).get("fields")),
+            tuple(str(note) for note in notes),
+        )
 
     def _populate_mini_docs(self) -> None:
         if not self._mini_text:
@@ -928,11 +1102,13 @@ class ControlCenterUI:
         if self._log_text is None:
             return
 
-        for line in log_buffer_handler.snapshot():
-            self._append_log(line)
+        backlog = log_buffer_handler.snapshot()
+        if backlog:
+            self._append_log(backlog)
 
-        def push(line: str) -> None:
-            self._schedule(lambda: self._append_log(line))
+        def push(lines: List[bytes]) -> None:
+            text = b"\n".join(lines).decode("utf-8")
+            self._schedule(lambda: self._append_log(text))
 
         self._log_callback = push
         log_buffer_handler.subscribe(push)
@@ -1068,9 +1244,16 @@ class ControlCenterUI:
         scrollbar.pack(side="right", fill="y")
         text_widget.configure(yscrollcommand=scrollbar.set)
         
-        text_widget.insert("1.0", render_documentation())
+        text_widget.insert("1.0", "Loading…")
         text_widget.configure(state="disabled")
 
+        # Build the catalog off the Tk thread and only marshal the final text back.
+        def worker() -> None:
+            documentation = render_documentation()
+            self._schedule(lambda: self._fill_doc_text(text_widget, documentation))
+
+        threading.Thread(target=worker, name="docs-render", daemon=True).start()
+
         def on_close() -> None:
             if self._doc_window is not None:
                 self._doc_window = None
@@ -1079,36 +1262,42 @@ class ControlCenterUI:
         doc_window.protocol("WM_DELETE_WINDOW", on_close)
         self._doc_window = doc_window
 
+    def _fill_doc_text(self, text_widget: "tk.Text", documentation: str) -> None:
+        try:
+            if not bool(text_widget.winfo_exists()):
+                return
+        except Exception:
+            return
+        text_widget.configure(state="normal")
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert("1.0", documentation)
+        text_widget.configure(state="disabled")
+
     def _copy_base_url(self) -> None:
         if self._root is None:
             return
         self._copy_to_clipboard(self._base_url, "Base URL copied to clipboard")
 
     def _schedule(self, callback: Callable[[], None]) -> None:
-        if self._root is None:
-            return
         try:
-            self._root.after(0, callback)
-        except Exception:
+            self._after(callback)
+        except (RuntimeError, tk.TclError):
+            # A worker-thread log record can race root.destroy() before _on_close swaps
+            # in _discard_callback.
             pass
 
-    def _format_fields(self, fields: Optional[Dict[str, str]]) -> List[str]:
-        if not isinstance(fields, dict):
-            return []
-        entries = []
-        for name, description in fields.items():
-            text = str(description).strip()
-            if not text.endswith(('.', '!', '?')):
-                text += '.'
-            entries.append(f"{name}: {text}")
-        return entries
+    @staticmethod
+    def _discard_callback(callback: Callable[[], None]) -> None:
+        """Stand-in for ``root.after`` while no Tk root is running."""
 
     def _on_close(self) -> None:
         if self._root is None:
             return
+        self._after = self._discard_callback
         self._root.destroy()
 
     def _teardown(self) -> None:
+        self._after = self._discard_callback
         if self._log_callback is not None:
             log_buffer_handler.unsubscribe(self._log_callback)
             self._log_callback = None
@@ -1127,6 +1316,15 @@ class ControlCenterUI:
         self._cards_canvas = None
         self._cards_frame = None
         self._cards_scroller = None
+        self._cards_window_id = None
+        self._cards_error_label = None
+        self._section_widgets = {}
+        self._card_widgets = {}
+        self._card_pool = []
+        self._scrollregion_scheduled = False
+        self._pending_canvas_width = None
+        self._pending_wheel_delta = 0
+        self._wheel_flush_scheduled = False
         self._mini_text = None
         self._mini_content_frame = None
         self._mini_arrow = None
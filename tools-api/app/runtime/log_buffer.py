@@ -8,56 +8,86 @@ from typing import Callable, Deque, List, Optional
 
 
 class UILogHandler(logging.Handler):
-    """Logging handler that buffers recent log records for the GUI."""
+    """Logging handler that buffers recent log records for the GUI.
+
+    Records are stored UTF-8 encoded so the buffer holds compact ``bytes`` objects;
+    text is only decoded when a consumer actually renders it. Listeners are called
+    from a single drainer thread with batches of lines so logging never blocks on
+    a slow consumer such as the Tk event loop.
+    """
+
+    # ``logging.Handler`` keeps its own ``__dict__``; slots still speed up our hot attributes.
+    __slots__ = ("_entries", "_lock", "_notify", "_pending", "_listeners", "_drainer")
 
     def __init__(self, max_entries: int = 500) -> None:
         super().__init__()
-        self._entries: Deque[str] = deque(maxlen=max_entries)
+        self._entries: Deque[bytes] = deque(maxlen=max_entries)
         self._lock = threading.Lock()
-        self._listeners: List[Callable[[str], None]] = []
+        self._notify = threading.Condition(self._lock)
+        self._pending: Deque[bytes] = deque()
+        self._listeners: List[Callable[[List[bytes]], None]] = []
+        self._drainer: Optional[threading.Thread] = None
 
     # Core logging API -------------------------------------------------
     def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover - visual side effect
-        message = self.format(record)
-        with self._lock:
+        message = self.format(record).encode("utf-8")
+        with self._notify:
             self._entries.append(message)
-            listeners = list(self._listeners)
-        for listener in listeners:
-            try:
-                listener(message)
-            except Exception:
-                # GUI listeners should never crash the logging pipeline.
-                pass
+            if self._listeners:
+                self._pending.append(message)
+                self._notify.notify()
+
+    def _drain(self) -> None:
+        while True:
+            with self._notify:
+                while not self._pending:
+                    self._notify.wait()
+                batch = list(self._pending)
+                self._pending.clear()
+                listeners = list(self._listeners)
+            for listener in listeners:
+                try:
+                    listener(batch)
+                except Exception:
+                    # GUI listeners should never crash the logging pipeline.
+                    pass
 
     # Data access ------------------------------------------------------
-    def snapshot(self) -> List[str]:
-        """Return a copy of the buffered log lines."""
+    def snapshot(self) -> str:
+        """Return the buffered log lines as a single newline-joined string."""
 
         with self._lock:
-            return list(self._entries)
+            data = b"\n".join(self._entries)
+        return data.decode("utf-8")
 
     def tail(self, limit: Optional[int] = None) -> List[str]:
         """Return the most recent *limit* entries (all by default)."""
 
         with self._lock:
-            if limit is None or limit >= len(self._entries):
-                return list(self._entries)
-            return list(self._entries)[-limit:]
+            entries = list(self._entries)
+        if limit is not None and limit < len(entries):
+            entries = entries[-limit:]
+        return [entry.decode("utf-8") for entry in entries]
 
     # Listener management ----------------------------------------------
-    def subscribe(self, callback: Callable[[str], None]) -> None:
-        """Register a callback to be notified when new log lines arrive."""
+    def subscribe(self, callback: Callable[[List[bytes]], None]) -> None:
+        """Register a callback that receives batches of newly arrived log lines."""
 
         with self._lock:
             if callback not in self._listeners:
                 self._listeners.append(callback)
+            if self._drainer is None:
+                self._drainer = threading.Thread(target=self._drain, name="ui-log-drain", daemon=True)
+                self._drainer.start()
 
-    def unsubscribe(self, callback: Callable[[str], None]) -> None:
+    def unsubscribe(self, callback: Callable[[List[bytes]], None]) -> None:
         """Remove a previously registered callback."""
 
         with self._lock:
             if callback in self._listeners:
                 self._listeners.remove(callback)
+            if not self._listeners:
+                self._pending.clear()
 
     def clear(self) -> None:
         """Remove all buffered entries."""
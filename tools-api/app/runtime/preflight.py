@@ -1,8 +1,11 @@
 """Pre-flight helpers to ensure optional toolchains are ready before serving traffic."""
 from __future__ import annotations
 
+import hashlib
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from app.config import settings
@@ -13,16 +16,45 @@ from app.services.yt_dlp_service import YtDlpServiceError, ensure_media_tools_re
 from app.utils.logger import logger
 
 
+_REQUIREMENTS_MARKER = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "tools-api" / "req.sha256"
+)
+
+
+def _requirements_digest(requirements_path: Path) -> str:
+    digest = hashlib.sha256(requirements_path.read_bytes())
+    # Different interpreters/virtualenvs need their own install, so fold the executable in.
+    digest.update(sys.executable.encode("utf-8"))
+    return digest.hexdigest()
+
+
 def _install_python_requirements() -> None:
     requirements_path = Path(__file__).resolve().parents[3] / "requirements.txt"
     if not requirements_path.exists():
         logger.debug("No requirements.txt found at %s", requirements_path)
         return
 
+    digest = _requirements_digest(requirements_path)
+    try:
+        if _REQUIREMENTS_MARKER.read_text(encoding="utf-8").strip() == digest:
+            logger.debug("Requirements unchanged since last install, skipping pip")
+            return
+    except OSError:
+        pass
+
     logger.info("Ensuring Python dependencies from %s", requirements_path)
     try:
         subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", str(requirements_path)],
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "--disable-pip-version-check",
+                "--no-input",
+                "-r",
+                str(requirements_path),
+            ],
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -31,56 +63,81 @@ def _install_python_requirements() -> None:
         logger.info("✅ Python dependencies installed or already satisfied.")
     except subprocess.CalledProcessError as exc:  # pragma: no cover - depends on runtime environment
         logger.warning("⚠️ Unable to install Python dependencies: %s", exc.stderr.strip() or exc)
+        return
 
+    try:
+        _REQUIREMENTS_MARKER.parent.mkdir(parents=True, exist_ok=True)
+        _REQUIREMENTS_MARKER.write_text(digest, encoding="utf-8")
+    except OSError as exc:  # pragma: no cover - read-only home directories
+        logger.debug("Unable to record requirements digest at %s: %s", _REQUIREMENTS_MARKER, exc)
 
-def prepare_environment() -> None:
-    """Run dependency checks for bundled tools.
-
-    The routine logs warnings instead of raising so the API can still launch when optional
-    runtimes (Node.js, yt-dlp) are unavailable. This mirrors the UX of the original desktop
-    control centre where optional features degrade gracefully.
-    """
-
-    logger.info("Performing Tools API pre-flight checks…")
-
-    _install_python_requirements()
 
+def _check_panosplitter() -> None:
     try:
         ensure_panosplitter_ready()
         logger.info("✅ Panosplitter is ready for JavaScript-powered slicing.")
     except JavaScriptToolError as exc:
         logger.warning("⚠️ Panosplitter unavailable: %s", exc)
 
+
+def _check_media_tools() -> None:
     try:
         ensure_media_tools_ready()
         logger.info("✅ yt-dlp dependency detected.")
     except YtDlpServiceError as exc:
         logger.warning("⚠️ Media toolkit unavailable: %s", exc)
 
+
+def _check_cobalt_gateway() -> None:
     try:
         gateway = create_gateway(
             remote_base_url=settings.COBALT_API_BASE_URL,
             auth_scheme=settings.COBALT_API_AUTH_SCHEME,
             auth_token=settings.COBALT_API_AUTH_TOKEN,
             timeout=settings.COBALT_API_TIMEOUT,
+            max_local_downloads=settings.COBALT_MAX_CONCURRENT_DOWNLOADS,
         )
     except CobaltError as exc:
         logger.warning("⚠️ Cobalt integrations unavailable: %s", exc)
-    else:
-        if gateway.has_remote and gateway.has_local:
-            logger.info("✅ Cobalt remote ready with local yt-dlp fallback.")
-        elif gateway.has_remote:
-            logger.info("✅ Cobalt remote endpoint ready: %s", settings.COBALT_API_BASE_URL)
-        elif gateway.has_local:
-            logger.info("✅ Local yt-dlp fallback enabled for Cobalt downloads.")
-
-        # Share the initialised gateway with the router so subsequent requests reuse it.
-        try:  # pragma: no cover - best effort cache priming
-            from app.routers import js_tools
-
-            js_tools._cobalt_gateway = gateway
-        except Exception:  # pragma: no cover - avoid hard failure during boot
-            logger.debug("Unable to prime Cobalt gateway cache for routers.")
+        return
+
+    if gateway.has_remote and gateway.has_local:
+        logger.info("✅ Cobalt remote ready with local yt-dlp fallback.")
+    elif gateway.has_remote:
+        logger.info("✅ Cobalt remote endpoint ready: %s", settings.COBALT_API_BASE_URL)
+    elif gateway.has_local:
+        logger.info("✅ Local yt-dlp fallback enabled for Cobalt downloads.")
+
+    # Share the initialised gateway with the router so subsequent requests reuse it.
+    try:  # pragma: no cover - best effort cache priming
+        from app.routers import js_tools
+
+        js_tools._cobalt_gateway = gateway
+    except Exception:  # pragma: no cover - avoid hard failure during boot
+        logger.debug("Unable to prime Cobalt gateway cache for routers.")
+
+
+def prepare_environment() -> None:
+    """Run dependency checks for bundled tools.
+
+    The routine logs warnings instead of raising so the API can still launch when optional
+    runtimes (Node.js, yt-dlp) are unavailable. This mirrors the UX of the original desktop
+    control centre where optional features degrade gracefully.
+
+    Python requirements are installed first, since the probes import what they provide.
+    The probes themselves are independent and mostly wait on subprocesses or the network,
+    so they run concurrently and each one logs its outcome as soon as it finishes.
+    """
+
+    logger.info("Performing Tools API pre-flight checks…")
+
+    _install_python_requirements()
+
+    checks = (_check_panosplitter, _check_media_tools, _check_cobalt_gateway)
+    with ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="preflight") as executor:
+        futures = [executor.submit(check) for check in checks]
+        for future in as_completed(futures):
+            future.result()
 
     logger.info("Pre-flight checks complete.")
 
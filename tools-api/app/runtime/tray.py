@@ -1,7 +1,7 @@
 """Utilities for presenting a system tray icon while the server is running."""
 from __future__ import annotations
 
-import importlib
+import importlib.machinery
 import importlib.util
 import os
 import sys
@@ -35,13 +35,30 @@ def _load_tray_backend() -> Optional["_TrayBackend"]:
     if pystray_spec is None or image_spec is None or draw_spec is None:
         return None
 
-    pystray = importlib.import_module("pystray")
-    image_module = importlib.import_module("PIL.Image")
-    image_draw_module = importlib.import_module("PIL.ImageDraw")
+    # The tray may never draw an icon (e.g. the session rejects it), so defer executing the
+    # modules until an attribute is first touched.
+    pystray = _lazy_import(pystray_spec)
+    image_module = _lazy_import(image_spec)
+    image_draw_module = _lazy_import(draw_spec)
 
     return _TrayBackend(pystray=pystray, image_module=image_module, image_draw_module=image_draw_module)
 
 
+def _lazy_import(spec: importlib.machinery.ModuleSpec) -> "module":
+    """Return a module that is only executed on first attribute access."""
+
+    existing = sys.modules.get(spec.name)
+    if existing is not None:
+        return existing
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    loader.exec_module(module)
+    return module
+
+
 @dataclass
 class _TrayBackend:
     pystray: "module"
@@ -171,34 +188,25 @@ class SystemTrayController:
                 pass
 
 
+_STATE_COLORS = {"running": "#E8F5E9", "failed": "#FFEBEE", "stopped": "#ECEFF1"}
+_STATE_INDICATOR_COLORS = {"running": "#2E7D32", "failed": "#C62828", "stopped": "#546E7A"}
+# Checked in order so statuses mentioning several keywords keep a fixed precedence.
+_STATUS_KEYWORDS = (("run", "running"), ("fail", "failed"), ("stop", "stopped"))
+
+
 def _state_color(state: str) -> str:
-    if state == "running":
-        return "#E8F5E9"
-    if state == "failed":
-        return "#FFEBEE"
-    if state == "stopped":
-        return "#ECEFF1"
-    return "#FFF8E1"
+    return _STATE_COLORS.get(state, "#FFF8E1")
 
 
 def _state_indicator_color(state: str) -> str:
-    if state == "running":
-        return "#2E7D32"
-    if state == "failed":
-        return "#C62828"
-    if state == "stopped":
-        return "#546E7A"
-    return "#F9A825"
+    return _STATE_INDICATOR_COLORS.get(state, "#F9A825")
 
 
 def _status_to_key(status: str) -> str:
     lowered = status.lower()
-    if "run" in lowered:
-        return "running"
-    if "fail" in lowered:
-        return "failed"
-    if "stop" in lowered:
-        return "stopped"
+    for keyword, key in _STATUS_KEYWORDS:
+        if keyword in lowered:
+            return key
     return "starting"
 
 
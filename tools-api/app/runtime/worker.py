@@ -1,52 +1,72 @@
 """Background worker controller for the local queue."""
 from __future__ import annotations
 
-from queue import Empty
+import time
 from threading import Event, Thread
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List
 
-from app.extensions import LocalQueueExtension
+from app.extensions import STOP_JOB_ID, LocalQueueExtension
 
 
 JobHandler = Callable[[Dict[str, str]], Dict]
 
 
 class BackgroundWorkerController:
-    """Manage a background thread that processes local queue jobs."""
+    """Manage a pool of background threads that process local queue jobs."""
 
-    def __init__(self, queue_extension: LocalQueueExtension, handler: JobHandler) -> None:
+    def __init__(
+        self,
+        queue_extension: LocalQueueExtension,
+        handler: JobHandler,
+        *,
+        max_workers: int = 4,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
         self._queue_extension = queue_extension
         self._handler = handler
+        self._max_workers = max_workers
         self._stop_event = Event()
-        self._thread: Optional[Thread] = None
+        self._threads: List[Thread] = []
 
     def start(self) -> None:
-        """Start the worker thread if it is not already running."""
-        if self._thread and self._thread.is_alive():
+        """Start the worker threads if they are not already running."""
+        if any(thread.is_alive() for thread in self._threads):
             return
         self._stop_event.clear()
-        self._thread = Thread(target=self._run, name="local-queue-worker", daemon=True)
-        self._thread.start()
+        self._threads = [
+            Thread(target=self._run, name=f"local-queue-worker-{index}", daemon=True)
+            for index in range(self._max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
 
     def stop(self, timeout: float | None = 2.0) -> None:
-        """Request the worker thread to stop and optionally wait for it."""
-        if not self._thread:
+        """Request the worker threads to stop and optionally wait for them."""
+        if not self._threads:
             return
         self._stop_event.set()
-        self._thread.join(timeout=timeout)
-        self._thread = None
+        for _ in self._threads:
+            self._queue_extension.wake_consumer()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(timeout=remaining)
+        self._threads = []
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     def _run(self) -> None:
         while not self._stop_event.is_set():
-            try:
-                job = self._queue_extension.dequeue(timeout=0.5)
-            except Empty:
+            # Block until a job arrives; stop() queues a sentinel to wake us up.
+            job = self._queue_extension.dequeue()
+            job_id = job["id"]
+            if job_id == STOP_JOB_ID:
+                # A sentinel left over from an earlier stop() is ignored after a restart.
+                self._queue_extension.task_done()
                 continue
 
-            job_id = job["id"]
             self._queue_extension.set_started(job_id)
 
             try:
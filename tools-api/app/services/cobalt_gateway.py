@@ -1,12 +1,14 @@
 """Unified entry point for the Cobalt tool with graceful fallbacks."""
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Dict, Optional
 
 from app.services.cobalt_local_service import LocalCobaltService, create_local_cobalt_service
 from app.services.cobalt_service import CobaltBinaryResult, CobaltError, CobaltService
 from app.services.yt_dlp_service import yt_dlp_service
+from app.utils import fastjson
 from app.utils.logger import logger
 
 
@@ -34,6 +36,7 @@ class CobaltGateway:
 
         self._remote = remote
         self._local = local
+        self._in_flight: Dict[bytes, "asyncio.Task[CobaltProcessResult]"] = {}
 
     @property
     def has_remote(self) -> bool:
@@ -43,6 +46,12 @@ class CobaltGateway:
     def has_local(self) -> bool:
         return self._local is not None
 
+    async def aclose(self) -> None:
+        """Release the remote client's pooled connections."""
+
+        if self._remote is not None:
+            await self._remote.aclose()
+
     async def process(
         self,
         payload: Dict[str, object],
@@ -50,8 +59,38 @@ class CobaltGateway:
         expect_binary: bool,
         filename_override: Optional[str] = None,
     ) -> CobaltProcessResult:
-        """Process a request using the best available backend."""
+        """Process a request using the best available backend.
+
+        Identical requests that arrive while one is already running share its result
+        instead of triggering another remote round trip or yt-dlp run.
+        """
 
+        key = fastjson.dumps([payload, expect_binary, filename_override], sort_keys=True)
+        task = self._in_flight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(
+                self._process(payload, expect_binary=expect_binary, filename_override=filename_override)
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one caller disconnecting does not cancel the work for the others.
+        result = await asyncio.shield(task)
+        if result.binary is not None:
+            # Each caller serves the shared file; it is removed once the last one is done.
+            result.binary.acquire()
+        return result
+
+    def _forget(self, key: bytes, task: "asyncio.Task[CobaltProcessResult]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    async def _process(
+        self,
+        payload: Dict[str, object],
+        *,
+        expect_binary: bool,
+        filename_override: Optional[str],
+    ) -> CobaltProcessResult:
         last_error: CobaltError | None = None
 
         if self._remote:
@@ -97,6 +136,7 @@ def create_gateway(
     auth_scheme: str,
     auth_token: str,
     timeout: float,
+    max_local_downloads: int = 2,
 ) -> CobaltGateway:
     """Factory helper that builds a :class:`CobaltGateway` with fallbacks."""
 
@@ -109,7 +149,7 @@ def create_gateway(
             timeout=timeout,
         )
 
-    local = create_local_cobalt_service(yt_dlp_service)
+    local = create_local_cobalt_service(yt_dlp_service, max_concurrent_downloads=max_local_downloads)
 
     return CobaltGateway(remote=remote, local=local)
 __all__ = ["CobaltGateway", "CobaltProcessResult", "create_gateway"]
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
+import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
 from app.services.cobalt_service import CobaltBinaryResult, CobaltError
 from app.services.yt_dlp_service import (
@@ -14,11 +16,32 @@ from app.services.yt_dlp_service import (
     YtDlpServiceError,
     ensure_media_tools_ready,
 )
+from app.utils import fastjson
 from app.utils.logger import logger
 
 
 DEFAULT_AUDIO_FORMAT = "mp3"
 DEFAULT_VIDEO_QUALITY = "1080"
+_EXPLICIT_MODES = frozenset({"audio", "video", "metadata"})
+# Legacy preset names map to a mode by keyword, checked in order ("youtube-audio" etc.).
+_PRESET_KEYWORDS = (("audio", "audio"), ("video", "video"))
+# Extracted info is reused for a follow-up download of the same URL while the format
+# URLs inside it are still fresh.
+_INFO_REUSE_TTL_SECONDS = 300.0
+_INFO_REUSE_MAX_ENTRIES = 32
+# Metadata lookups are cached per URL and option set; extraction refetches the page and
+# player scripts, which takes seconds.
+_METADATA_CACHE_TTL_SECONDS = 300.0
+_METADATA_CACHE_MAX_ENTRIES = 512
+
+
+def _default_cache_dir() -> Path:
+    """Resolve the persistent yt-dlp cache (player JS, signature functions)."""
+
+    override = os.getenv("YTDLP_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "tools-api" / "yt-dlp"
 
 
 @dataclass
@@ -32,8 +55,31 @@ class LocalProcessResult:
 class LocalCobaltService:
     """Translate common Cobalt payloads into local yt-dlp invocations."""
 
-    def __init__(self, yt_dlp_service: YtDlpService) -> None:
+    def __init__(
+        self,
+        yt_dlp_service: YtDlpService,
+        *,
+        max_concurrent_downloads: int = 2,
+        cache_dir: Path | None = None,
+    ) -> None:
         self._yt_dlp = yt_dlp_service
+        self._cache_dir = self._prepare_cache_dir(cache_dir or _default_cache_dir())
+        self._max_concurrent_downloads = max(1, max_concurrent_downloads)
+        self._download_slots: asyncio.Semaphore | None = None
+        self._download_slots_loop: asyncio.AbstractEventLoop | None = None
+        self._active_downloads = 0
+        self._queued_downloads = 0
+        self._recent_info: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._metadata_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _prepare_cache_dir(path: Path) -> Path | None:
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            logger.warning("yt-dlp cache directory %s is unusable (%s); using yt-dlp's default", path, exc)
+            return None
+        return path
 
     def check_dependencies(self) -> None:
         """Ensure yt-dlp is importable before accepting requests."""
@@ -74,37 +120,107 @@ class LocalCobaltService:
         options: Dict[str, Any],
         filename_override: Optional[str],
     ) -> DownloadResult:
-        """Execute a blocking download in a worker thread."""
-
-        return await asyncio.to_thread(
-            self._yt_dlp.download,
-            url,
-            options=options,
-            filename_override=filename_override,
-        )
+        """Execute a blocking download in a worker thread.
+
+        At most ``max_concurrent_downloads`` yt-dlp/ffmpeg runs happen at once; further
+        requests wait here rather than occupying threads from the shared pool.
+        """
+
+        slots = self._get_download_slots()
+        self._queued_downloads += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._queued_downloads -= 1
+
+        self._active_downloads += 1
+        try:
+            return await asyncio.to_thread(
+                self._yt_dlp.download,
+                url,
+                options=options,
+                filename_override=filename_override,
+                info=self._recent_info_for(url),
+            )
+        finally:
+            self._active_downloads -= 1
+            slots.release()
+
+    def _get_download_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        # Semaphores bind to the loop they first block on, so keep one per running loop.
+        if self._download_slots is None or self._download_slots_loop is not loop:
+            self._download_slots = asyncio.Semaphore(self._max_concurrent_downloads)
+            self._download_slots_loop = loop
+        return self._download_slots
+
+    @property
+    def download_load(self) -> Dict[str, int]:
+        """Return how many downloads are running and how many are waiting for a slot."""
+
+        return {"active": self._active_downloads, "queued": self._queued_downloads}
 
     async def _run_metadata(self, url: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve metadata for a URL using a worker thread."""
 
-        return await asyncio.to_thread(
+        key = (url, fastjson.dumps(options, sort_keys=True))
+        cached = self._metadata_cache.get(key)
+        if cached is not None:
+            stored_at, info = cached
+            if time.monotonic() - stored_at <= _METADATA_CACHE_TTL_SECONDS:
+                self._metadata_cache.move_to_end(key)
+                return info
+            del self._metadata_cache[key]
+
+        info = await asyncio.to_thread(
             self._yt_dlp.extract_info,
             url,
             options=options,
         )
+        self._metadata_cache[key] = (time.monotonic(), info)
+        while len(self._metadata_cache) > _METADATA_CACHE_MAX_ENTRIES:
+            self._metadata_cache.popitem(last=False)
+        self._remember_info(url, info)
+        return info
+
+    def clear_metadata_cache(self) -> None:
+        """Drop cached metadata and info kept for follow-up downloads."""
+
+        self._metadata_cache.clear()
+        self._recent_info.clear()
+
+    def _remember_info(self, url: str, info: Dict[str, Any]) -> None:
+        self._recent_info[url] = (time.monotonic(), info)
+        self._recent_info.move_to_end(url)
+        while len(self._recent_info) > _INFO_REUSE_MAX_ENTRIES:
+            self._recent_info.popitem(last=False)
+
+    def _recent_info_for(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._recent_info.get(url)
+        if entry is None:
+            return None
+        stored_at, info = entry
+        if time.monotonic() - stored_at > _INFO_REUSE_TTL_SECONDS:
+            del self._recent_info[url]
+            return None
+        return info
 
     def _resolve_mode(self, payload: Dict[str, Any]) -> str:
         """Determine the desired download mode from the payload."""
 
-        mode = (payload.get("downloadMode") or "auto").lower()
-        if mode in {"audio", "video", "metadata"}:
-            return mode
+        mode = payload.get("downloadMode")
+        if mode:
+            mode = mode.lower()
+            if mode in _EXPLICIT_MODES:
+                return mode
 
         # Legacy cobalt shortcuts frequently set "preset" instead of downloadMode.
-        preset = (payload.get("preset") or "").lower()
-        if preset.startswith("youtube-audio") or "audio" in preset:
-            return "audio"
-        if preset.startswith("youtube-video") or "video" in preset:
-            return "video"
+        preset = payload.get("preset")
+        if preset:
+            preset = preset.lower()
+            for keyword, preset_mode in _PRESET_KEYWORDS:
+                if keyword in preset:
+                    return preset_mode
 
         return "auto"
 
@@ -128,6 +244,10 @@ class LocalCobaltService:
         if payload.get("disableMetadata"):
             options.setdefault("noprogress", True)
 
+        # Share one on-disk cache so player JS and signature functions survive between runs.
+        if self._cache_dir is not None:
+            options.setdefault("cachedir", str(self._cache_dir))
+
         return options
 
     def _audio_options(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -161,14 +281,16 @@ class LocalCobaltService:
         return {"format": "bv*+ba/b"}
 
     def _build_metadata_from_download(self, download: DownloadResult, mode: str) -> Dict[str, Any]:
-        metadata = dict(download.metadata or {})
+        # The DownloadResult belongs to this request, so extend its metadata in place
+        # rather than copying a potentially large yt-dlp info dict.
+        metadata = download.metadata if download.metadata is not None else {}
         metadata.update(
             {
                 "status": "local",
                 "mode": mode,
                 "filename": download.filename,
                 "contentType": download.content_type,
-                "filesize": len(download.content),
+                "filesize": download.size,
                 "source": "yt-dlp",
                 "backend": "local",
             }
@@ -178,21 +300,20 @@ class LocalCobaltService:
     def _build_binary_response(
         self, download: DownloadResult, metadata: Dict[str, Any]
     ) -> CobaltBinaryResult:
-        payload = {k: v for k, v in metadata.items() if k != "content"}
-        encoded_metadata = base64.b64encode(
-            json.dumps(payload, ensure_ascii=False).encode("utf-8")
-        ).decode("utf-8")
+        metadata.pop("content", None)
 
+        # Served straight from yt-dlp's temporary directory, which goes once the response is sent.
         return CobaltBinaryResult(
-            content=download.content,
+            path=download.path,
             filename=download.filename,
             content_type=download.content_type,
-            metadata=payload,
-            encoded_metadata=encoded_metadata,
+            metadata=metadata,
+            cleanup=download.close,
         )
 
     def _build_metadata_from_info(self, info: Dict[str, Any], mode: str) -> Dict[str, Any]:
-        metadata = self._yt_dlp._serializable_metadata(info)
+        # Copy so the cached info dict is not mutated with response-only fields.
+        metadata = dict(self._yt_dlp._serializable_metadata(info))
         metadata.update(
             {
                 "status": "local",
@@ -206,10 +327,12 @@ class LocalCobaltService:
         return metadata
 
 
-def create_local_cobalt_service(yt_dlp_service: YtDlpService) -> LocalCobaltService | None:
+def create_local_cobalt_service(
+    yt_dlp_service: YtDlpService, *, max_concurrent_downloads: int = 2
+) -> LocalCobaltService | None:
     """Factory helper that returns a ready-to-use local fallback if possible."""
 
-    service = LocalCobaltService(yt_dlp_service)
+    service = LocalCobaltService(yt_dlp_service, max_concurrent_downloads=max_concurrent_downloads)
     try:
         service.check_dependencies()
     except YtDlpServiceError:
@@ -1,34 +1,117 @@
 """Client helpers for integrating with a Cobalt media downloader instance."""
 from __future__ import annotations
 
+import asyncio
 import base64
-import json
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import functools
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
 
 import httpx
 
+from app.utils import fastjson
 from app.utils.logger import logger
 
+# Chunk size used when streaming media from Cobalt to disk.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Bytes buffered in memory before each write is handed to a worker thread.
+DOWNLOAD_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+# Attempts made for transient failures (connection errors, read timeouts, 5xx).
+RETRY_ATTEMPTS = 3
+# Connection attempts retried inside the transport before a request fails.
+CONNECT_RETRIES = 3
+
+_T = TypeVar("_T")
+
 
 class CobaltError(RuntimeError):
     """Raised when communication with a Cobalt instance fails."""
 
 
-@dataclass
 class CobaltBinaryResult:
-    """Binary download returned by the Cobalt service."""
+    """Binary download returned by the Cobalt service.
+
+    Remote downloads are streamed to disk and exposed through ``path``; in-memory
+    payloads use ``content``. The base64 metadata header is only built if
+    ``encoded_metadata`` is read.
+
+    Files on disk are temporary: each response serving the payload calls
+    :meth:`acquire` and, once sent, :meth:`release`; ``cleanup`` runs after the last
+    release, or when the result is garbage collected if nobody served it.
+    """
+
+    __slots__ = (
+        "filename",
+        "content_type",
+        "metadata",
+        "content",
+        "path",
+        "_encoded_metadata",
+        "_users",
+        "_cleanup",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        *,
+        filename: str,
+        content_type: str,
+        metadata: Dict[str, Any],
+        encoded_metadata: Optional[str] = None,
+        content: Optional[bytes] = None,
+        path: Optional[Path] = None,
+        cleanup: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.metadata = metadata
+        self.content = content
+        self.path = path
+        self._encoded_metadata = encoded_metadata
+        self._users = 0
+        self._cleanup = weakref.finalize(self, cleanup) if cleanup is not None else None
+
+    @property
+    def encoded_metadata(self) -> str:
+        """Base64 JSON form of ``metadata`` suitable for a response header."""
+
+        if self._encoded_metadata is None:
+            self._encoded_metadata = base64.b64encode(fastjson.dumps(self.metadata)).decode("ascii")
+        return self._encoded_metadata
+
+    def read_bytes(self) -> bytes:
+        """Return the payload, loading it from disk when it was streamed there."""
+
+        if self.content is not None:
+            return self.content
+        if self.path is None:
+            raise CobaltError("Cobalt download has no content")
+        return self.path.read_bytes()
+
+    def acquire(self) -> "CobaltBinaryResult":
+        """Register a response that will serve this payload."""
+
+        self._users += 1
+        return self
 
-    content: bytes
-    filename: str
-    content_type: str
-    metadata: Dict[str, Any]
-    encoded_metadata: str
+    def release(self) -> None:
+        """Mark one response as done; the last one removes any temporary files."""
+
+        self._users -= 1
+        if self._users <= 0 and self._cleanup is not None:
+            self._cleanup()
 
 
 class CobaltService:
     """Thin wrapper around the Cobalt HTTP API."""
 
+    # Base delay in seconds between retries; doubled after each failed attempt.
+    retry_backoff: float = 0.5
+
     def __init__(
         self,
         *,
@@ -36,6 +119,8 @@ class CobaltService:
         auth_scheme: Optional[str] = None,
         auth_token: Optional[str] = None,
         timeout: Optional[float] = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        download_dir: Optional[Path] = None,
     ) -> None:
         if not base_url:
             raise CobaltError("Cobalt API base URL is not configured")
@@ -44,6 +129,55 @@ class CobaltService:
         self.auth_scheme = auth_scheme or ""
         self.auth_token = auth_token or ""
         self.timeout = timeout
+        self._transport = transport
+        # Parent for per-download temporary directories; None uses the system default.
+        self._download_dir = download_dir
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive client, creating it on first use."""
+
+        loop = asyncio.get_running_loop()
+        # httpx clients are bound to the loop that opened their connections; a new loop
+        # (e.g. a fresh test client) gets a fresh pool.
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=limits,
+                transport=self._transport or httpx.AsyncHTTPTransport(retries=CONNECT_RETRIES, limits=limits),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+
+        client, self._client = self._client, None
+        if client is not None and not client.is_closed and self._client_loop is asyncio.get_running_loop():
+            await client.aclose()
+        self._client_loop = None
+
+    async def _with_retries(self, operation: Callable[[], Awaitable[_T]]) -> _T:
+        """Run ``operation``, retrying transient upstream failures with exponential backoff."""
+
+        last_attempt = RETRY_ATTEMPTS - 1
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return await operation()
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code < 500 or attempt == last_attempt:
+                    raise
+                reason = f"status {exc.response.status_code}"
+            except (httpx.ConnectError, httpx.ReadTimeout) as exc:
+                if attempt == last_attempt:
+                    raise
+                reason = type(exc).__name__
+            delay = self.retry_backoff * 2**attempt
+            logger.warning("Cobalt request failed (%s); retrying in %.1fs", reason, delay)
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
 
     def _headers(self) -> Dict[str, str]:
         headers = {
@@ -61,10 +195,17 @@ class CobaltService:
 
         logger.info("Submitting request to Cobalt at %s", self.endpoint)
 
+        async def submit() -> httpx.Response:
+            client = await self._get_client()
+            response = await client.post(self.endpoint, json=payload, headers=self._headers())
+            response.raise_for_status()
+            return response
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.endpoint, json=payload, headers=self._headers())
-                response.raise_for_status()
+            response = await self._with_retries(submit)
+        except httpx.PoolTimeout as exc:
+            logger.error("No free connection to the Cobalt instance: %s", exc)
+            raise CobaltError("Cobalt upstream is busy") from exc
         except httpx.HTTPStatusError as exc:
             detail = exc.response.text
             logger.error("Cobalt request failed with status %s: %s", exc.response.status_code, detail)
@@ -74,8 +215,8 @@ class CobaltService:
             raise CobaltError("Unable to reach Cobalt instance") from exc
 
         try:
-            data = response.json()
-        except json.JSONDecodeError as exc:
+            data = fastjson.loads(response.content)
+        except fastjson.JSONDecodeError as exc:
             logger.error("Cobalt response was not valid JSON: %s", response.text[:200])
             raise CobaltError("Cobalt response was not valid JSON") from exc
 
@@ -99,10 +240,43 @@ class CobaltService:
 
         filename = filename_override or result.get("filename") or "cobalt-download.bin"
 
+        # ``result`` is the freshly decoded API response, so annotate it directly.
+        metadata = result
+        metadata.setdefault("downloadUrl", download_url)
+
+        async def fetch() -> Tuple[Path, str]:
+            # Auth headers are only sent to the API endpoint, never to redirect targets.
+            client = await self._get_client()
+            workdir = Path(tempfile.mkdtemp(prefix="cobalt-", dir=self._download_dir))
+            try:
+                async with client.stream("GET", download_url) as response:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    content_type = response.headers.get("content-type", "application/octet-stream")
+                    # Stream straight to a temporary file so large media never sits in memory.
+                    path = workdir / (Path(filename).name or "cobalt-download.bin")
+                    with path.open("wb") as handle:
+                        # Keep large media writes off the event loop, batching chunks so each
+                        # thread hop writes several MiB instead of one network read.
+                        buffer = bytearray()
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            buffer += chunk
+                            if len(buffer) >= DOWNLOAD_WRITE_BUFFER_SIZE:
+                                await asyncio.to_thread(handle.write, buffer)
+                                buffer = bytearray()
+                        if buffer:
+                            await asyncio.to_thread(handle.write, buffer)
+            except BaseException:
+                shutil.rmtree(workdir, ignore_errors=True)
+                raise
+            return path, content_type
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(download_url)
-                response.raise_for_status()
+            path, content_type = await self._with_retries(fetch)
+        except httpx.PoolTimeout as exc:
+            logger.error("No free connection for the Cobalt download: %s", exc)
+            raise CobaltError("Cobalt upstream is busy") from exc
         except httpx.HTTPStatusError as exc:
             logger.error("Cobalt download failed (%s): %s", exc.response.status_code, exc.response.text[:200])
             raise CobaltError("Unable to download media from Cobalt") from exc
@@ -110,17 +284,10 @@ class CobaltService:
             logger.error("Cobalt download encountered a network error: %s", exc)
             raise CobaltError("Unable to download media from Cobalt") from exc
 
-        content_type = response.headers.get("content-type", "application/octet-stream")
-
-        metadata = dict(result)
-        metadata.setdefault("downloadUrl", download_url)
-
-        encoded_metadata = base64.b64encode(json.dumps(metadata, ensure_ascii=False).encode("utf-8")).decode("utf-8")
-
         return CobaltBinaryResult(
-            content=response.content,
+            path=path,
             filename=filename,
             content_type=content_type,
             metadata=metadata,
-            encoded_metadata=encoded_metadata,
+            cleanup=functools.partial(shutil.rmtree, path.parent, ignore_errors=True),
         )
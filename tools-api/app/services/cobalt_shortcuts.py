@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Literal
+from types import MappingProxyType
+from typing import Any, Dict, Literal, Mapping, Tuple
 
 
 @dataclass(frozen=True)
@@ -16,7 +17,7 @@ class CobaltShortcut:
     response_format: Literal["json", "binary"] = "json"
 
 
-_SHORTCUTS: List[CobaltShortcut] = [
+_SHORTCUTS: Tuple[CobaltShortcut, ...] = (
     CobaltShortcut(
         slug="youtube-audio",
         label="YouTube → MP3",
@@ -61,13 +62,16 @@ _SHORTCUTS: List[CobaltShortcut] = [
         },
         response_format="json",
     ),
-]
+)
 
 
-SHORTCUT_REGISTRY = {shortcut.slug: shortcut for shortcut in _SHORTCUTS}
+# Read-only view so the registry can be shared freely without defensive copies.
+SHORTCUT_REGISTRY: Mapping[str, CobaltShortcut] = MappingProxyType(
+    {shortcut.slug: shortcut for shortcut in _SHORTCUTS}
+)
 
 
-def list_shortcuts() -> Iterable[CobaltShortcut]:
+def list_shortcuts() -> Tuple[CobaltShortcut, ...]:
     """Return the registered shortcuts in declaration order."""
 
-    return list(_SHORTCUTS)
+    return _SHORTCUTS
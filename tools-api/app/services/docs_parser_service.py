@@ -1,9 +1,63 @@
 import json
-from typing import Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import re
 from dataclasses import dataclass
 from urllib.parse import urlparse
 
+from app.utils import fastjson
+
+
+# Stop at whitespace, angle brackets and quotes so URLs embedded in markup or quoted
+# text do not swallow their delimiters.
+_URL_RE = re.compile(r'https?://[^\s<>"\']+')
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_url(url: str) -> bool:
+    """Check if a string is a valid URL.
+
+    Cached because documents tend to repeat the same links many times.
+    """
+    try:
+        result = urlparse(url)
+        return bool(result.scheme and result.netloc)
+    except ValueError:
+        return False
+
+
+_TEXT = "t"
+_IMAGE = "i"
+
+
+def _walk_content(content: List[Dict]) -> Iterator[Tuple[str, str]]:
+    """Yield ``(_TEXT, content)`` and ``(_IMAGE, uri)`` pairs in document order.
+
+    Uses an explicit stack rather than recursion, so deeply nested tables cost no
+    extra Python frames.
+    """
+    stack: List[Dict] = list(reversed(content))
+    while stack:
+        item = stack.pop()
+        if 'paragraph' in item:
+            for element in item['paragraph'].get('elements', ()):
+                if 'textRun' in element:
+                    text = element['textRun'].get('content')
+                    if text is not None:
+                        yield _TEXT, text
+                elif 'inlineObjectElement' in element:
+                    properties = element['inlineObjectElement'].get('imageProperties')
+                    if properties and properties.get('sourceUri'):
+                        yield _IMAGE, properties['sourceUri']
+        elif 'table' in item:
+            cells = [
+                cell
+                for row in item['table'].get('tableRows', ())
+                for cell in row.get('tableCells', ())
+            ]
+            for cell in reversed(cells):
+                stack.extend(reversed(cell.get('content', ())))
+
 
 @dataclass
 class ExtractedContent:
@@ -15,119 +69,61 @@ class ExtractedContent:
 class GoogleDocsParser:
     def __init__(self):
         self._text_segments: List[str] = []
-        self._urls: List[str] = []
-        self._images: List[str] = []
+        # Dicts double as insertion-ordered sets, deduplicating as items arrive.
+        self._urls: Dict[str, None] = {}
+        self._images: Dict[str, None] = {}
         
-    def _is_valid_url(self, url: str) -> bool:
-        """Check if a string is a valid URL."""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except ValueError:
-            return False
-            
     def _extract_urls_from_text(self, text: str) -> tuple:
         """Extract URLs from text and return cleaned text and URL list."""
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        found_urls = re.findall(url_pattern, text)
-        
-        clean_text = text
-        for url in found_urls:
-            clean_text = clean_text.replace(url, ' ')
-        
-        clean_text = ' '.join(clean_text.split())
-        return clean_text, [url for url in found_urls if self._is_valid_url(url)]
+        found_urls = _URL_RE.findall(text)
+        # One regex pass instead of re-scanning the text once per URL.
+        clean_text = ' '.join(_URL_RE.sub(' ', text).split())
+        return clean_text, [url for url in found_urls if _is_valid_url(url)]
 
-    def _process_text_run(self, text_run: Dict) -> None:
-        """Process a text run element from the Google Docs JSON."""
-        if 'content' not in text_run:
-            return
-            
-        content = text_run['content']
-        if content.strip():
-            clean_text, urls = self._extract_urls_from_text(content)
-            if clean_text:
-                self._text_segments.append(clean_text)
-            self._urls.extend(urls)
-
-    def _process_inline_object(self, element: Dict) -> None:
-        """Process an inline object (like images) from the Google Docs JSON."""
-        if 'inlineObjectElement' in element:
-            inline_obj = element['inlineObjectElement']
-            if 'imageProperties' in inline_obj:
-                source_uri = inline_obj['imageProperties'].get('sourceUri')
-                if source_uri and self._is_valid_url(source_uri):
-                    self._images.append(source_uri)
-
-    def _process_paragraph(self, paragraph: Dict) -> None:
-        """Process a paragraph element from the Google Docs JSON."""
-        if 'elements' not in paragraph:
-            return
-            
-        for element in paragraph['elements']:
-            if 'textRun' in element:
-                self._process_text_run(element['textRun'])
-            elif 'inlineObjectElement' in element:
-                self._process_inline_object(element)
-
-    def _process_table(self, table: Dict) -> None:
-        """Process a table element from the Google Docs JSON."""
-        if 'tableRows' not in table:
-            return
-            
-        for row in table['tableRows']:
-            if 'tableCells' in row:
-                for cell in row['tableCells']:
-                    if 'content' in cell:
-                        for content_item in cell['content']:
-                            if 'paragraph' in content_item:
-                                self._process_paragraph(content_item['paragraph'])
-
-    def _process_content(self, content: List[Dict]) -> None:
-        """Process the main content array from the Google Docs JSON."""
-        for item in content:
-            if 'paragraph' in item:
-                self._process_paragraph(item['paragraph'])
-            elif 'table' in item:
-                self._process_table(item['table'])
-
-    def parse_docs_json(self, docs_json: Union[str, List, Dict]) -> ExtractedContent:
+    def parse_docs_json(self, docs_json: Union[str, bytes, List, Dict]) -> ExtractedContent:
         """Parse Google Docs JSON and return structured content."""
-        # Reset state
-        self._text_segments = []
-        self._urls = []
-        self._images = []
-        
         # Parse JSON if string
-        if isinstance(docs_json, str):
+        if isinstance(docs_json, (str, bytes)):
             try:
-                docs_data = json.loads(docs_json)
-            except json.JSONDecodeError:
+                docs_data = fastjson.loads(docs_json)
+            except fastjson.JSONDecodeError:
                 raise ValueError("Invalid JSON string")
         else:
             docs_data = docs_json
 
         # The input is directly an array of content objects
+        content: List[Dict] = []
         if isinstance(docs_data, list):
-            self._process_content(docs_data)
+            content = docs_data
         # Handle case where there's a body wrapper
         elif isinstance(docs_data, dict):
             if 'body' in docs_data and 'content' in docs_data['body']:
-                self._process_content(docs_data['body']['content'])
+                content = docs_data['body']['content']
             elif 'content' in docs_data:
-                self._process_content(docs_data['content'])
-        
+                content = docs_data['content']
+
+        text_segments: List[str] = []
+        urls: Dict[str, None] = {}
+        images: Dict[str, None] = {}
+        for kind, value in _walk_content(content):
+            if kind == _TEXT:
+                if value.strip():
+                    clean_text, found_urls = self._extract_urls_from_text(value)
+                    if clean_text:
+                        text_segments.append(clean_text)
+                    for url in found_urls:
+                        urls.setdefault(url)
+            elif _is_valid_url(value):
+                images.setdefault(value)
+        self._text_segments, self._urls, self._images = text_segments, urls, images
+
         # Join text segments with appropriate spacing
-        full_text = ' '.join(self._text_segments)
-        
-        # Remove duplicate URLs and images while preserving order
-        unique_urls = list(dict.fromkeys(self._urls))
-        unique_images = list(dict.fromkeys(self._images))
-        
+        full_text = ' '.join(text_segments)
+
         return ExtractedContent(
             text=full_text.strip(),
-            urls=unique_urls,
-            images=unique_images
+            urls=list(urls),
+            images=list(images)
         )
 
 
@@ -1,6 +1,59 @@
-from typing import List
+from typing import Iterator, List
 from io import BytesIO
+import zipfile
+
 from docx import Document
+from lxml import etree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = f"{_W}body"
+_PARAGRAPH = f"{_W}p"
+_RUN = f"{_W}r"
+_HYPERLINK = f"{_W}hyperlink"
+# Text equivalents of run content, matching python-docx's ``Run.text``.
+_RUN_TEXT = {f"{_W}tab": "\t", f"{_W}ptab": "\t", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-"}
+
+
+def _run_text(run) -> Iterator[str]:
+    for child in run:
+        tag = child.tag
+        if tag == f"{_W}t":
+            yield child.text or ""
+        elif tag == f"{_W}br":
+            if child.get(f"{_W}type", "textWrapping") == "textWrapping":
+                yield "\n"
+        else:
+            text = _RUN_TEXT.get(tag)
+            if text:
+                yield text
+
+
+def _paragraph_text(paragraph) -> str:
+    parts: List[str] = []
+    for child in paragraph:
+        if child.tag == _RUN:
+            parts.extend(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            for run in child.iterchildren(_RUN):
+                parts.extend(_run_text(run))
+    return "".join(parts)
+
+
+def _body_paragraph_texts(document) -> Iterator[str]:
+    """Yield the text of each body-level paragraph, discarding parsed elements as it goes."""
+    # Uploaded XML is untrusted: never expand entities or fetch anything (XXE), as
+    # python-docx's own parser is configured.
+    paragraphs = etree.iterparse(
+        document, events=("end",), tag=_PARAGRAPH, resolve_entities=False, no_network=True
+    )
+    for _, element in paragraphs:
+        parent = element.getparent()
+        if parent is None or parent.tag != _BODY:
+            continue
+        yield _paragraph_text(element)
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
 
 
 def parse_docx_to_text(file_bytes: bytes) -> str:
@@ -9,29 +62,36 @@ def parse_docx_to_text(file_bytes: bytes) -> str:
     Returns a single string with newlines between paragraphs.
     """
     bio = BytesIO(file_bytes)
-    doc = Document(bio)
-    parts: List[str] = []
-    for para in doc.paragraphs:
-        parts.append(para.text)
-    return "\n".join(parts)
+    try:
+        # Stream body paragraphs instead of building python-docx's object model.
+        with zipfile.ZipFile(bio) as archive, archive.open("word/document.xml") as document:
+            return "\n".join(_body_paragraph_texts(document))
+    except (KeyError, zipfile.BadZipFile):
+        # Unusual package layout or not a zip at all; let python-docx resolve or reject it.
+        bio.seek(0)
+        doc = Document(bio)
+        return "\n".join(para.text for para in doc.paragraphs)
 
 
 def create_docx_from_text(text: str) -> bytes:
-    """Create a .docx file from plain text. Paragraphs separated by double-newline or single newline preserved."""
+    """Create a .docx file from plain text, one paragraph per line.
+
+    Blank lines separate paragraphs; within a run of blank lines every second one is
+    kept as an empty paragraph.
+    """
     doc = Document()
-    # Split into paragraphs by blank lines
-    paras = [p for p in text.split("\n\n")]
-    for p in paras:
-        # preserve internal newlines inside a paragraph by replacing them with line breaks
-        # python-docx doesn't support line breaks easily; add as separate paragraphs
-        lines = p.split("\n")
-        for i, line in enumerate(lines):
-            if i == 0:
-                doc.add_paragraph(line)
-            else:
-                doc.add_paragraph(line)
+    lines = text.split("\n")
+    last = len(lines) - 1
+    keep_blank = False
+    for index, line in enumerate(lines):
+        if not line and 0 < index < last:
+            if keep_blank:
+                doc.add_paragraph("")
+            keep_blank = not keep_blank
+            continue
+        keep_blank = False
+        doc.add_paragraph(line)
 
     bio = BytesIO()
     doc.save(bio)
-    bio.seek(0)
-    return bio.read()
+    return bio.getvalue()
@@ -1,13 +1,14 @@
 """Lightweight on-disk storage for generated media downloads."""
 from __future__ import annotations
 
-import json
 import os
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from uuid import uuid4
 
+from app.utils import fastjson
 from app.utils.logger import logger
 
 
@@ -25,6 +26,9 @@ class StoredDownload:
 class DownloadStore:
     """Persist yt-dlp downloads so they can be fetched via stable URLs."""
 
+    # Key recorded in ``metadata.json`` naming the content file next to it.
+    CONTENT_FILE_KEY = "__content_file"
+
     def __init__(self, root: Path | None = None) -> None:
         base_path = root or self._default_root()
         self.root = base_path
@@ -44,24 +48,51 @@ class DownloadStore:
     def store(self, *, filename: str, content: bytes, content_type: str, metadata: Dict[str, Any]) -> StoredDownload:
         """Persist a binary payload and return the structured descriptor."""
 
+        file_id, target_dir, file_path = self._allocate(filename)
+        file_path.write_bytes(content)
+        return self._finalize(file_id, target_dir, file_path, content_type, metadata)
+
+    def store_file(self, *, filename: str, source: Path, content_type: str, metadata: Dict[str, Any]) -> StoredDownload:
+        """Move a file already on disk into the store.
+
+        A rename when *source* is on the same filesystem, otherwise a chunked copy; the
+        payload is never read into memory.
+        """
+
+        file_id, target_dir, file_path = self._allocate(filename)
+        try:
+            shutil.move(os.fspath(source), file_path)
+        except BaseException:
+            shutil.rmtree(target_dir, ignore_errors=True)
+            raise
+        return self._finalize(file_id, target_dir, file_path, content_type, metadata)
+
+    def _allocate(self, filename: str) -> Tuple[str, Path, Path]:
         file_id = uuid4().hex
         target_dir = self.root / file_id
         target_dir.mkdir(parents=True, exist_ok=False)
 
         safe_name = Path(filename).name or "download.bin"
-        file_path = target_dir / safe_name
-        file_path.write_bytes(content)
-
+        return file_id, target_dir, target_dir / safe_name
+
+    def _finalize(
+        self,
+        file_id: str,
+        target_dir: Path,
+        file_path: Path,
+        content_type: str,
+        metadata: Dict[str, Any],
+    ) -> StoredDownload:
         metadata_path = target_dir / "metadata.json"
-        metadata_payload = json.dumps(metadata, ensure_ascii=False, default=str)
-        metadata_path.write_text(metadata_payload, encoding="utf-8")
+        persisted = {**metadata, self.CONTENT_FILE_KEY: file_path.name}
+        metadata_path.write_bytes(fastjson.dumps(persisted))
 
         logger.debug("Stored download %s at %s", file_id, file_path)
 
         return StoredDownload(
             file_id=file_id,
             path=file_path,
-            filename=safe_name,
+            filename=file_path.name,
             content_type=content_type or "application/octet-stream",
             metadata=metadata,
         )
@@ -70,21 +101,27 @@ class DownloadStore:
         """Load a stored download descriptor or raise :class:`FileNotFoundError`."""
 
         target_dir = self.root / file_id
-        if not target_dir.exists() or not target_dir.is_dir():
-            raise FileNotFoundError(f"Download {file_id!r} not found")
-
-        files = [path for path in target_dir.iterdir() if path.is_file() and path.name != "metadata.json"]
-        if not files:
-            raise FileNotFoundError(f"Download {file_id!r} is missing content")
-
-        file_path = files[0]
         metadata_path = target_dir / "metadata.json"
         metadata: Dict[str, Any] = {}
-        if metadata_path.exists():
-            try:
-                metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                logger.warning("Metadata for %s is not valid JSON", file_id)
+        try:
+            metadata = fastjson.loads(metadata_path.read_bytes())
+        except FileNotFoundError:
+            if not target_dir.is_dir():
+                raise FileNotFoundError(f"Download {file_id!r} not found") from None
+        except fastjson.JSONDecodeError:
+            logger.warning("Metadata for %s is not valid JSON", file_id)
+
+        content_name = metadata.pop(self.CONTENT_FILE_KEY, None)
+        if content_name:
+            file_path = target_dir / Path(content_name).name
+            if not file_path.is_file():
+                raise FileNotFoundError(f"Download {file_id!r} is missing content")
+        else:
+            # Downloads stored before the content file was recorded.
+            files = [path for path in target_dir.iterdir() if path.is_file() and path.name != "metadata.json"]
+            if not files:
+                raise FileNotFoundError(f"Download {file_id!r} is missing content")
+            file_path = files[0]
 
         content_type = metadata.get("content_type") or "application/octet-stream"
         original_name = metadata.get("filename") or file_path.name
@@ -1,21 +1,52 @@
 """Utilities for interacting with the system FFmpeg binary."""
 from __future__ import annotations
 
+import io
 import mimetypes
+import os
 import re
 import shutil
 import subprocess
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from threading import Lock
-from typing import Iterable, Tuple
+from threading import Lock, Thread
+from types import MappingProxyType
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Mapping, Sequence, Tuple
 
 from fastapi import UploadFile
 
-FORMAT_LINE_PATTERN = re.compile(r"^\s*([D\.])([E\.])\s+([^\s]+)")
+_FORMAT_NAME_PATTERN = re.compile(r"[a-z0-9_]+")
 _CACHE_TTL_SECONDS = 60 * 60  # one hour
+# Large copy buffer for uploads; the 16KiB default costs tens of thousands of syscalls
+# for a few hundred MB of media.
+_COPY_BUFFER_SIZE = 1 << 20
+
+# Input formats FFmpeg can demux from a non-seekable pipe. Anything else (notably
+# MP4/MOV, whose index may sit at the end of the file) is written to disk first.
+_STREAMABLE_INPUTS = frozenset(
+    {
+        "s16le", "s16be", "s24le", "s32le", "f32le", "f64le", "u8", "s8", "alaw", "mulaw",
+        "wav", "mp3", "ogg", "flac", "aac", "adts", "mpegts", "webm", "matroska",
+    }
+)
+
+# Kernel-side fd-to-fd copies, tried in order: (src_fd, dst_fd, src_offset, count) -> copied.
+_KERNEL_COPIERS: List[Callable[[int, int, int, int], int]] = []
+if hasattr(os, "copy_file_range"):  # Linux; reflinks on CoW filesystems
+    _KERNEL_COPIERS.append(lambda src, dst, offset, count: os.copy_file_range(src, dst, count, offset))
+if hasattr(os, "sendfile"):
+    _KERNEL_COPIERS.append(lambda src, dst, offset, count: os.sendfile(dst, src, offset, count))
+
+
+@lru_cache(maxsize=256)
+def _media_type_for(target_format: str) -> str:
+    """Media type for an output format; targets come from FFmpeg's finite muxer list."""
+    mime_type, _ = mimetypes.guess_type(f"output.{target_format}")
+    return mime_type or "application/octet-stream"
 
 
 class FfmpegServiceError(RuntimeError):
@@ -31,27 +62,49 @@ class ConversionResult:
     workdir: Path
 
 
+@dataclass(frozen=True)
+class _FormatCatalog:
+    """Probed FFmpeg formats: the public listing plus sets for membership tests."""
+    listing: Mapping[str, Tuple[str, ...]]
+    inputs: frozenset[str]
+    outputs: frozenset[str]
+
+
 class FfmpegService:
     """Lightweight wrapper around the FFmpeg CLI for conversions."""
 
     def __init__(self) -> None:
         self._cache_lock = Lock()
-        self._cached_formats: Tuple[float, dict[str, list[str]]] | None = None
+        self._cached_formats: Tuple[float, _FormatCatalog] | None = None
+
+    def list_formats(self) -> Mapping[str, Tuple[str, ...]]:
+        """Return supported FFmpeg demuxer/muxer formats with caching.
+
+        The mapping is a read-only view shared between callers.
+        """
+        return self._catalog().listing
+
+    def has_input(self, fmt: str) -> bool:
+        """Return whether FFmpeg can demux ``fmt`` (a normalised format name)."""
+        return fmt in self._catalog().inputs
+
+    def has_output(self, fmt: str) -> bool:
+        """Return whether FFmpeg can mux ``fmt`` (a normalised format name)."""
+        return fmt in self._catalog().outputs
 
-    def list_formats(self) -> dict[str, list[str]]:
-        """Return supported FFmpeg demuxer/muxer formats with caching."""
+    def _catalog(self) -> _FormatCatalog:
         with self._cache_lock:
             if self._cached_formats is not None:
-                cached_at, payload = self._cached_formats
+                cached_at, catalog = self._cached_formats
                 if time.monotonic() - cached_at < _CACHE_TTL_SECONDS:
-                    return {k: v.copy() for k, v in payload.items()}
+                    return catalog
 
-        formats = self._probe_formats()
+        catalog = self._probe_formats()
         with self._cache_lock:
-            self._cached_formats = (time.monotonic(), formats)
-        return {k: v.copy() for k, v in formats.items()}
+            self._cached_formats = (time.monotonic(), catalog)
+        return catalog
 
-    def _probe_formats(self) -> dict[str, list[str]]:
+    def _probe_formats(self) -> _FormatCatalog:
         try:
             completed = subprocess.run(
                 ["ffmpeg", "-hide_banner", "-formats"],
@@ -71,28 +124,54 @@ class FfmpegService:
         demuxers: set[str] = set()
         muxers: set[str] = set()
 
-        for raw_line in completed.stdout.splitlines():
-            match = FORMAT_LINE_PATTERN.match(raw_line)
-            if not match:
-                continue
-            demux_flag, mux_flag, names = match.groups()
+        for demux, mux, names in self._parse_format_lines(completed.stdout):
             for candidate in self._split_format_names(names):
-                if demux_flag == "D":
+                if demux:
                     demuxers.add(candidate)
-                if mux_flag == "E":
+                if mux:
                     muxers.add(candidate)
 
-        return {
-            "inputs": sorted(demuxers),
-            "outputs": sorted(muxers),
-            "common": sorted(demuxers & muxers),
+        listing = {
+            "inputs": tuple(sorted(demuxers)),
+            "outputs": tuple(sorted(muxers)),
+            "common": tuple(sorted(demuxers & muxers)),
         }
+        return _FormatCatalog(
+            listing=MappingProxyType(listing),
+            inputs=frozenset(demuxers),
+            outputs=frozenset(muxers),
+        )
+
+    @staticmethod
+    def _parse_format_lines(output: str) -> Iterator[Tuple[bool, bool, str]]:
+        """Yield ``(demux, mux, names)`` for each row of ``ffmpeg -formats``.
+
+        The table is fixed-width: a flag column (``DE`` on older builds, ``DEd`` on
+        newer ones, with spaces or dots for unset flags) followed by the names. The
+        dashed separator under the legend gives the flag width, and rows start after it.
+        """
+        lines = output.splitlines()
+        start, width = 0, 2
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped and stripped.strip("-") == "":
+                start, width = index + 1, len(stripped)
+                break
+
+        for line in lines[start:]:
+            if len(line) <= width + 1 or line[0] != " ":
+                continue
+            flags = line[1 : width + 1]
+            names = line[width + 1 :].split(None, 1)
+            if names:
+                yield flags[0] == "D", flags[1] == "E", names[0]
 
     @staticmethod
     def _split_format_names(value: str) -> Iterable[str]:
         for item in value.split(","):
             cleaned = item.strip().lower()
-            if cleaned:
+            # Also drops legend rows ("D. = Demuxing supported") on builds without a separator.
+            if cleaned and _FORMAT_NAME_PATTERN.fullmatch(cleaned):
                 yield cleaned
 
     def convert_upload(
@@ -108,10 +187,8 @@ class FfmpegService:
         if not target_format or not target_format.strip():
             raise FfmpegServiceError("target_format is required")
 
-        available = self.list_formats()
-
         normalised_target = self._normalise_format(target_format)
-        if normalised_target not in {fmt.lower() for fmt in available["outputs"]}:
+        if not self.has_output(normalised_target):
             raise FfmpegServiceError(
                 f"FFmpeg does not support exporting to '{target_format}'."
             )
@@ -119,21 +196,30 @@ class FfmpegService:
         normalised_source: str | None = None
         if source_format and source_format.strip():
             normalised_source = self._normalise_format(source_format)
-            if normalised_source not in {fmt.lower() for fmt in available["inputs"]}:
+            if not self.has_input(normalised_source):
                 raise FfmpegServiceError(
                     f"FFmpeg cannot ingest files tagged as '{source_format}'."
                 )
 
         workdir = Path(tempfile.mkdtemp(prefix="ffmpeg-convert-"))
-        input_path = self._write_upload(upload, workdir, normalised_source)
 
-        # Defensive: ensure input file exists and has content
-        if not input_path.exists():
-            raise FfmpegServiceError("Uploaded file could not be written to disk.")
-        try:
-            size = input_path.stat().st_size
-        except OSError:
-            size = 0
+        # Streamable formats go straight to FFmpeg's stdin, skipping the temp-file copy.
+        stream_input = normalised_source in _STREAMABLE_INPUTS
+        if stream_input:
+            size = self._upload_size(upload)
+            stream_input = size >= 0
+            input_arg = "pipe:0"
+        if not stream_input:
+            input_path = self._write_upload(upload, workdir, normalised_source)
+
+            # Defensive: ensure input file exists and has content
+            if not input_path.exists():
+                raise FfmpegServiceError("Uploaded file could not be written to disk.")
+            try:
+                size = input_path.stat().st_size
+            except OSError:
+                size = 0
+            input_arg = str(input_path)
         if size <= 0:
             raise FfmpegServiceError("Uploaded file appears to be empty.")
 
@@ -156,16 +242,19 @@ class FfmpegService:
             else:
             # Provide container hint if specified
                 command.extend(["-f", normalised_source])
-        command.extend(["-i", str(input_path), str(output_path)])
+        command.extend(["-i", input_arg, str(output_path)])
 
         try:
-            # Capture stderr/stdout for clear error diagnostics
-            completed = subprocess.run(
-                command,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            if stream_input:
+                self._run_with_stdin(command, upload.file)
+            else:
+                # Capture stderr/stdout for clear error diagnostics
+                subprocess.run(
+                    command,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
         except FileNotFoundError as exc:  # pragma: no cover
             raise FfmpegServiceError(
                 "FFmpeg is not installed or not available on the PATH."
@@ -181,15 +270,106 @@ class FfmpegService:
                 "FFmpeg reported success but no output file was created."
             )
 
-        mime_type, _ = mimetypes.guess_type(output_filename)
-        media_type = mime_type or "application/octet-stream"
         return ConversionResult(
             output_path=output_path,
             filename=output_filename,
-            media_type=media_type,
+            media_type=_media_type_for(normalised_target),
             workdir=workdir,
         )
 
+    @staticmethod
+    def _upload_size(upload: UploadFile) -> int:
+        """Return the upload's size and rewind it, or ``-1`` if it cannot be measured."""
+        try:
+            upload.file.seek(0, os.SEEK_END)
+            size = upload.file.tell()
+            upload.file.seek(0)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return -1
+        return size
+
+    @staticmethod
+    def _run_with_stdin(command: list[str], source: BinaryIO) -> None:
+        """Run FFmpeg while a helper thread feeds ``source`` into its stdin."""
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+        def feed() -> None:
+            try:
+                shutil.copyfileobj(source, process.stdin, _COPY_BUFFER_SIZE)
+            except (BrokenPipeError, ValueError):
+                pass  # FFmpeg exited early; its stderr explains why.
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        feeder = Thread(target=feed, name="ffmpeg-stdin", daemon=True)
+        feeder.start()
+        # Drain stderr on this thread so FFmpeg never blocks on a full pipe.
+        stderr = process.stderr.read()
+        process.stderr.close()
+        returncode = process.wait()
+        feeder.join()
+        if returncode:
+            raise subprocess.CalledProcessError(
+                returncode, command, stderr=stderr.decode("utf-8", errors="replace")
+            )
+
+    def convert_uploads(
+        self,
+        uploads: Sequence[UploadFile],
+        *,
+        source_format: str | None,
+        target_format: str,
+        sample_rate: int = 24000,
+        channels: int = 1,
+        max_workers: int | None = None,
+    ) -> list[ConversionResult]:
+        """Convert several uploads concurrently, returning results in input order.
+
+        Each file still gets its own FFmpeg process so one bad input cannot fail the
+        others' encode, but the processes overlap instead of running back to back. By
+        default one core is left free for the API itself. If any conversion fails, the
+        work directories of the successful ones are removed and the first error raised.
+        """
+        if not uploads:
+            return []
+        workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+
+        def convert(upload: UploadFile) -> ConversionResult:
+            return self.convert_upload(
+                upload,
+                source_format=source_format,
+                target_format=target_format,
+                sample_rate=sample_rate,
+                channels=channels,
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(uploads)), thread_name_prefix="ffmpeg-batch"
+        ) as executor:
+            futures = [executor.submit(convert, upload) for upload in uploads]
+
+        results: list[ConversionResult] = []
+        error: BaseException | None = None
+        for future in futures:
+            exc = future.exception()
+            if exc is None:
+                results.append(future.result())
+            elif error is None:
+                error = exc
+        if error is not None:
+            for result in results:
+                self.cleanup_directory(result.workdir)
+            raise error
+        return results
+
     def cleanup_directory(self, directory: Path | str | None) -> None:
         if not directory:
             return
@@ -204,7 +384,7 @@ class FfmpegService:
         cleaned = value.strip().lower().lstrip(".")
         if not cleaned:
             raise FfmpegServiceError("Format names must contain letters or numbers.")
-        if not re.fullmatch(r"[a-z0-9_]+", cleaned):
+        if not _FORMAT_NAME_PATTERN.fullmatch(cleaned):
             raise FfmpegServiceError(
                 "Format names may only include letters, numbers, or underscores."
             )
@@ -236,10 +416,61 @@ class FfmpegService:
             pass
 
         with destination.open("wb") as buffer:
-            shutil.copyfileobj(upload.file, buffer)
+            FfmpegService._copy_upload(upload.file, buffer)
 
         return destination
 
+    @staticmethod
+    def _copy_upload(source: BinaryIO, destination: BinaryIO) -> None:
+        if FfmpegService._copy_upload_in_kernel(source, destination):
+            return
+
+        readinto = getattr(source, "readinto", None)
+        if readinto is None:
+            shutil.copyfileobj(source, destination, _COPY_BUFFER_SIZE)
+            return
+
+        view = memoryview(bytearray(_COPY_BUFFER_SIZE))
+        while True:
+            count = readinto(view)
+            if not count:
+                break
+            destination.write(view[:count])
+
+    @staticmethod
+    def _copy_upload_in_kernel(source: BinaryIO, destination: BinaryIO) -> bool:
+        """Copy a disk-backed upload without passing it through user space.
+
+        Returns ``False`` when the source has no real descriptor or the kernel refuses
+        every strategy before copying anything, so the caller can fall back. A spooled
+        upload still held in memory is rolled to disk by ``fileno()``; the spool is small
+        by definition, so that costs one short write.
+        """
+        if not _KERNEL_COPIERS:
+            return False
+        try:
+            src_fd = source.fileno()
+            dst_fd = destination.fileno()
+            offset = source.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return False
+
+        remaining = os.fstat(src_fd).st_size - offset
+        for copy in _KERNEL_COPIERS:
+            copied = 0
+            try:
+                while copied < remaining:
+                    count = copy(src_fd, dst_fd, offset + copied, remaining - copied)
+                    if not count:
+                        break
+                    copied += count
+            except OSError as exc:
+                if copied:
+                    raise FfmpegServiceError("Uploaded file could not be written to disk.") from exc
+                continue
+            return True
+        return False
+
     @staticmethod
     def _build_output_filename(original_name: str | None, target_format: str) -> str:
         candidate = "converted"
@@ -8,6 +8,18 @@ from typing import Dict
 import numpy as np
 from PIL import Image, ImageFilter
 
+try:  # pragma: no cover - depends on the environment
+    import cv2
+except ImportError:  # pragma: no cover - optional dependency
+    cv2 = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - depends on the environment
+    import simplejpeg
+except ImportError:  # pragma: no cover - optional dependency
+    simplejpeg = None  # type: ignore[assignment]
+
+_JPEG_QUALITY = 95
+
 
 class HalationsError(RuntimeError):
     """Raised when an image cannot be processed with the halations effect."""
@@ -46,24 +58,19 @@ class HalationsService:
         if image.mode != "RGB":
             image = image.convert("RGB")
 
-        original = np.asarray(image, dtype=np.float32)
-        brightness = original.mean(axis=2)
-
-        mask = (brightness >= self.brightness_threshold).astype(np.float32)
-        mask_image = Image.fromarray((mask * 255).astype(np.uint8))
-
-        if self.blur_amount > 0:
-            mask_image = mask_image.filter(ImageFilter.GaussianBlur(radius=self.blur_amount))
+        pixels = np.asarray(image)
+        # mean >= threshold, tested on the integer channel sum so the mask never leaves
+        # 8/16-bit integers.
+        bright = pixels.sum(axis=2, dtype=np.uint16) >= self.brightness_threshold * 3
+        mask = bright.view(np.uint8) * np.uint8(255)
 
-        blurred_mask = np.asarray(mask_image, dtype=np.float32) / 255.0
-
-        overlay = np.zeros_like(original)
-        overlay[..., 0] = np.clip(blurred_mask * 255 + self.strength, 0, 255)
-
-        result = self._screen_blend(original, overlay)
-
-        buffer = io.BytesIO()
-        Image.fromarray(result.astype(np.uint8)).save(buffer, format="JPEG", quality=95)
+        # The glow only lands in the red channel; green and blue pass through untouched,
+        # so only the red plane goes through the blend.
+        result = pixels.copy()
+        if cv2 is not None:
+            result[..., 0] = self._red_glow_uint8(np.ascontiguousarray(pixels[..., 0]), mask)
+        else:
+            result[..., 0] = self._red_glow_float(pixels[..., 0], mask)
 
         metadata = {
             "width": int(image.width),
@@ -75,16 +82,63 @@ class HalationsService:
 
         filename = "halations-result.jpg"
         return HalationsResult(
-            content=buffer.getvalue(),
+            content=self._encode_jpeg(result),
             filename=filename,
             content_type="image/jpeg",
             metadata=metadata,
         )
 
     @staticmethod
-    def _screen_blend(base: np.ndarray, overlay: np.ndarray) -> np.ndarray:
-        base_norm = base / 255.0
-        overlay_norm = overlay / 255.0
-        blended = 1 - (1 - base_norm) * (1 - overlay_norm)
-        return np.clip(blended * 255.0, 0, 255)
+    def _encode_jpeg(pixels: np.ndarray) -> bytes:
+        """Encode an RGB uint8 array, via libjpeg-turbo (simplejpeg) when installed."""
+
+        if simplejpeg is not None:
+            # Same settings as Pillow's encoder (4:2:0 chroma, accurate DCT), so the output
+            # doesn't depend on which library happens to be installed.
+            return simplejpeg.encode_jpeg(
+                pixels, quality=_JPEG_QUALITY, colorspace="RGB", colorsubsampling="420", fastdct=False
+            )
 
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="JPEG", quality=_JPEG_QUALITY)
+        return buffer.getvalue()
+
+    def _red_glow_uint8(self, red: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Glow the red plane with OpenCV, staying in saturating uint8 throughout."""
+
+        if self.blur_amount > 0:
+            # Pillow's radius is the Gaussian standard deviation, as is OpenCV's sigma.
+            mask = cv2.GaussianBlur(mask, (0, 0), self.blur_amount)
+        glow = cv2.add(mask, self.strength)
+        # Screen blend: 255 - (255 - base) * (255 - glow) / 255.
+        return cv2.bitwise_not(
+            cv2.multiply(cv2.bitwise_not(red), cv2.bitwise_not(glow), scale=1.0 / 255.0)
+        )
+
+    def _red_glow_float(self, red: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Glow the red plane with Pillow's blur and a float32 screen blend."""
+
+        mask_image = Image.fromarray(mask)
+        if self.blur_amount > 0:
+            # Pillow already implements GaussianBlur as three extended box-blur passes,
+            # so the cost is linear in pixels and independent of the radius.
+            mask_image = mask_image.filter(ImageFilter.GaussianBlur(radius=self.blur_amount))
+
+        glow = np.asarray(mask_image, dtype=np.float32)
+        glow += self.strength
+        np.clip(glow, 0, 255, out=glow)
+        return self._screen_blend(red.astype(np.float32), glow)
+
+    @staticmethod
+    def _screen_blend(base: np.ndarray, overlay: np.ndarray) -> np.ndarray:
+        """Screen-blend two float planes in ``[0, 255]``, reusing ``base`` as the output.
+
+        ``255 - (255 - base) * (255 - overlay) / 255`` evaluated in place: no temporaries
+        beyond ``overlay`` itself and no clip, since the result stays in range.
+        """
+        np.subtract(255.0, base, out=base)
+        np.subtract(255.0, overlay, out=overlay)
+        base *= overlay
+        base *= 1.0 / 255.0
+        np.subtract(255.0, base, out=base)
+        return base
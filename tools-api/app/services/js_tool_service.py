@@ -2,17 +2,21 @@
 from __future__ import annotations
 
 import base64
+import io
 import json
 import re
 import shutil
 import subprocess
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence
 import zipfile
 
+from app.utils import fastjson
 from app.utils.logger import logger
 
 
@@ -36,6 +40,10 @@ class PanosplitterResult:
 
 NODE_EXECUTABLE = shutil.which("node")
 NPM_EXECUTABLE = shutil.which("npm")
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]")
+# Read size for base64 encoding; a multiple of 3 so chunks encode without padding.
+_B64_CHUNK_SIZE = 3 * 256 * 1024
+_MAX_ENCODE_WORKERS = 8
 
 
 def _ensure_node_available() -> None:
@@ -54,8 +62,14 @@ def _ensure_node_available() -> None:
         )
 
 
+@lru_cache(maxsize=8)
 def _ensure_dependencies(tool_dir: Path) -> None:
-    """Install npm dependencies for the JavaScript tool if necessary."""
+    """Install npm dependencies for the JavaScript tool if necessary.
+
+    Memoised per directory once it succeeds (failures are not cached), so steady-state
+    requests skip the filesystem checks. Use ``_ensure_dependencies.cache_clear()`` to
+    force a re-check.
+    """
 
     node_modules = tool_dir / "node_modules"
     package_json = tool_dir / "package.json"
@@ -100,12 +114,13 @@ def _parse_cli_output(stdout: str) -> PanosplitterResult:
     if not stdout:
         raise JavaScriptToolError("JavaScript tool returned no output")
 
-    # Some CLIs might emit multiple lines. The JSON payload is expected to be on the last line.
-    json_payload = stdout.splitlines()[-1]
+    # Some CLIs might emit multiple lines. The JSON payload is expected to be on the last line;
+    # rpartition grabs it without splitting the preceding log output into a list.
+    json_payload = stdout.rpartition("\n")[2]
 
     try:
-        payload = json.loads(json_payload)
-    except json.JSONDecodeError as exc:
+        payload = fastjson.loads(json_payload)
+    except fastjson.JSONDecodeError as exc:
         raise JavaScriptToolError("Unable to decode JavaScript tool output as JSON") from exc
 
     if "error" in payload:
@@ -163,10 +178,23 @@ def _invoke_panosplitter_cli(
     return _parse_cli_output(result.stdout)
 
 
+def _b64encode_stream(handle: BinaryIO) -> str:
+    """Base64 encode a binary stream chunk by chunk.
+
+    Only the encoded output is held in full; the raw bytes never are.
+    """
+
+    encoded = bytearray()
+    while chunk := handle.read(_B64_CHUNK_SIZE):
+        encoded += base64.b64encode(chunk)
+    return encoded.decode("ascii")
+
+
 def _encode_file(path: Path) -> Dict[str, str]:
     """Base64 encode a file for transport over HTTP."""
 
-    data = base64.b64encode(path.read_bytes()).decode("utf-8")
+    with path.open("rb") as handle:
+        data = _b64encode_stream(handle)
     return {
         "filename": path.name,
         "content_type": "image/jpeg",
@@ -175,34 +203,30 @@ def _encode_file(path: Path) -> Dict[str, str]:
 
 
 def _create_zip_payload(
-    directory: Path,
+    files: Sequence[Path],
     manifest: Dict[str, Any],
     zip_name: str = "panosplitter_slices.zip",
 ) -> Dict[str, str]:
     """Bundle the generated assets into a base64-encoded zip file."""
 
-    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp_file:
-        tmp_path = Path(tmp_file.name)
-
-    try:
-        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
-            for file_path in sorted(directory.glob("*.jpg")):
-                zip_file.write(file_path, arcname=file_path.name)
-
-            zip_file.writestr(
-                "manifest.json",
-                json.dumps(manifest, indent=2, ensure_ascii=False),
-            )
+    # Built in memory: the archive is base64-encoded right away, so a temp file would
+    # only add a write and a read-back.
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for file_path in files:
+            # The images are already compressed (JPEG); deflating them burns CPU for ~0% gain.
+            zip_file.write(file_path, arcname=file_path.name, compress_type=zipfile.ZIP_STORED)
+
+        zip_file.writestr(
+            "manifest.json",
+            json.dumps(manifest, indent=2, ensure_ascii=False),
+        )
 
-        zip_data = base64.b64encode(tmp_path.read_bytes()).decode("utf-8")
-        return {
-            "filename": zip_name,
-            "base64": zip_data,
-            "content_type": "application/zip",
-        }
-    finally:
-        if tmp_path.exists():
-            tmp_path.unlink()
+    return {
+        "filename": zip_name,
+        "base64": base64.b64encode(buffer.getbuffer()).decode("ascii"),
+        "content_type": "application/zip",
+    }
 
 
 def _sanitize_filename(filename: Optional[str]) -> str:
@@ -229,7 +253,7 @@ def _sanitize_filename(filename: Optional[str]) -> str:
     ext = Path(base).suffix.lower()
 
     # Replace any character that isn't alphanumeric, dot, underscore or dash
-    name = re.sub(r"[^A-Za-z0-9._-]", "_", name)
+    name = _UNSAFE_FILENAME_RE.sub("_", name)
 
     if not name:
         name = uuid.uuid4().hex
@@ -279,13 +303,22 @@ def run_panosplitter(
 
         result = _invoke_panosplitter_cli(cli_path, input_path, output_dir, mode, timeout=timeout)
 
-        slices_payload = []
-        manifest_slices: List[Dict[str, Any]] = []
+        asset_paths: List[Path] = []
         for slice_info in result.slices:
             file_path = output_dir / slice_info["filename"]
             if not file_path.exists():
                 raise JavaScriptToolError(f"Expected slice not found: {file_path.name}")
-            encoded = _encode_file(file_path)
+            asset_paths.append(file_path)
+
+        # File reads release the GIL, so encoding the slices on a few threads overlaps I/O.
+        encoded_slices: List[Dict[str, str]] = []
+        if asset_paths:
+            with ThreadPoolExecutor(max_workers=min(_MAX_ENCODE_WORKERS, len(asset_paths))) as pool:
+                encoded_slices = list(pool.map(_encode_file, asset_paths))
+
+        slices_payload = []
+        manifest_slices: List[Dict[str, Any]] = []
+        for slice_info, file_path, encoded in zip(result.slices, asset_paths, encoded_slices):
             encoded.update({
                 "width": slice_info.get("width"),
                 "height": slice_info.get("height"),
@@ -334,7 +367,8 @@ def run_panosplitter(
             "full_view": manifest_full_view,
         }
 
-        zip_payload = _create_zip_payload(output_dir, manifest)
+        # The slices were already located and checked above; no need to rescan the directory.
+        zip_payload = _create_zip_payload([*asset_paths, full_view_path], manifest)
 
         return {
             "metadata": metadata,
@@ -4,337 +4,525 @@ import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 import re
 import colorsys
+import threading
+from functools import lru_cache
+
+from app.utils import fastjson
+
+_MARKDOWN_EXTENSIONS = ['extra', 'nl2br', 'sane_lists']
+# markdown.Markdown instances are stateful, so each worker thread keeps its own.
+_markdown_local = threading.local()
+
+# Retried jobs and template replays resend identical documents, so finished request
+# lists are memoised as JSON bytes (decoded fresh per call, so callers may mutate them).
+# Large inputs skip the cache to bound its memory.
+_PARSE_CACHE_SIZE = 256
+_PARSE_CACHE_MAX_INPUT = 256 * 1024
+
+_RE_RGB = re.compile(r'rgba?\((\d+),\s*(\d+),\s*(\d+)(?:,\s*[\d.]+)?\)')
+_RE_FONT_WEIGHT = re.compile(r'font-weight:\s*(\w+|\d+)')
+_RE_FONT_FAMILY = re.compile(r'font-family:\s*([^;]+)')
+_RE_FONT_SIZE_PT = re.compile(r'font-size:\s*(\d+(?:\.\d+)?)pt')
+_RE_FONT_SIZE_PX = re.compile(r'font-size:\s*(\d+(?:\.\d+)?)px')
+_RE_COLOR = re.compile(r'color:\s*([^;]+)')
+_RE_BACKGROUND_COLOR = re.compile(r'background-color:\s*([^;]+)')
+_RE_NON_NUMERIC = re.compile(r'[^\d.]')
+
+_NAMED_COLOR_RGB: Dict[str, Tuple[float, float, float]] = {
+    "red": (1, 0, 0),
+    "blue": (0, 0, 1),
+    "green": (0, 0.5, 0),
+    "yellow": (1, 1, 0),
+    "orange": (1, 0.647, 0),
+    "purple": (0.5, 0, 0.5),
+    "pink": (1, 0.753, 0.796),
+    "black": (0, 0, 0),
+    "white": (1, 1, 1),
+    "gray": (0.5, 0.5, 0.5),
+    "grey": (0.5, 0.5, 0.5),
+}
+
+
+# Google Docs heading sizes (approximate)
+_HEADING_SIZES = {
+    'h1': 20,
+    'h2': 16,
+    'h3': 14,
+    'h4': 12,
+    'h5': 11,
+    'h6': 11
+}
+
+
+# Style shapes for the common attribute-less tags. Each parser interns its own copies up
+# front (results reach callers, who may mutate them), so _get_text_style can hand them out
+# without building a dict.
+_STYLE_PLAIN: Dict[str, Any] = {}
+_STYLE_BOLD: Dict[str, Any] = {"bold": True}
+_STYLE_ITALIC: Dict[str, Any] = {"italic": True}
+_STYLE_UNDERLINE: Dict[str, Any] = {"underline": True}
+_STYLE_STRIKETHROUGH: Dict[str, Any] = {"strikethrough": True}
+_TAG_STYLES: Dict[str, Dict[str, Any]] = {
+    'b': _STYLE_BOLD,
+    'strong': _STYLE_BOLD,
+    'i': _STYLE_ITALIC,
+    'em': _STYLE_ITALIC,
+    'u': _STYLE_UNDERLINE,
+    's': _STYLE_STRIKETHROUGH,
+    'strike': _STYLE_STRIKETHROUGH,
+    'del': _STYLE_STRIKETHROUGH,
+}
+# Tags that add no text style of their own: without style/color attributes they simply
+# inherit the parent's style.
+_STYLE_NEUTRAL_TAGS = frozenset({
+    'html', 'body', 'p', 'div', 'span', 'section', 'article', 'blockquote', 'a', 'br', 'hr',
+    'img', 'ul', 'ol', 'li', 'table', 'thead', 'tbody', 'tr', 'td', 'th',
+})
+
+
+def _parse_dimension(value: Any) -> Optional[float]:
+    """Read a numeric size such as ``"120px"`` from an HTML attribute, dropping units."""
+    try:
+        return float(_RE_NON_NUMERIC.sub('', str(value)))
+    except ValueError:
+        return None
+
+
+def _rgb_to_gdoc(rgb: Tuple[float, float, float]) -> Dict[str, Any]:
+    """Wrap an (r, g, b) tuple in the Google Docs ``OptionalColor`` shape."""
+    red, green, blue = rgb
+    return {"color": {"rgbColor": {"red": red, "green": green, "blue": blue}}}
+
+
+@lru_cache(maxsize=512)
+def _parse_css_color(color: str) -> Optional[Tuple[float, float, float]]:
+    """Resolve a CSS color string to an (r, g, b) tuple in ``[0, 1]``.
+
+    Documents repeat the same handful of colors, so results are cached per string.
+    """
+    # Handle named colors
+    named = _NAMED_COLOR_RGB.get(color.lower())
+    if named is not None:
+        return named
+
+    # Handle hex colors
+    if color[:1] == "#":
+        digits = color[1:]
+        size = len(digits)
+        try:
+            if size == 6 or size == 3:
+                # One hex parse, channels split with shifts; #abc widens to #aabbcc.
+                value = int(digits, 16)
+                if size == 3:
+                    value = ((value & 0xF00) * 0x1100) | ((value & 0x0F0) * 0x110) | ((value & 0x00F) * 0x11)
+                return ((value >> 16) / 255, ((value >> 8) & 0xFF) / 255, (value & 0xFF) / 255)
+            r, g, b = [int(digits[i:i+2], 16) / 255 for i in (0, 2, 4)]
+            return (r, g, b)
+        except ValueError:
+            return None
+
+    # Handle rgb/rgba
+    rgb_match = _RE_RGB.match(color)
+    if rgb_match:
+        r, g, b = [int(x) / 255 for x in rgb_match.groups()]
+        return (r, g, b)
+    return None
+
+
+def _child_tags(el: Tag, names: Tuple[str, ...]) -> List[Tag]:
+    """Return the direct child tags of ``el`` named in ``names``, in document order.
+
+    A plain walk over ``.children``; cheaper than ``find_all(..., recursive=False)``.
+    """
+    return [child for child in el.children if isinstance(child, Tag) and child.name in names]
+
+
+# Work-stack actions for RichTextParser._process_element.
+_ENTER, _BLOCK_END, _CLOSE_BLOCK, _CLOSE_DIV, _CLOSE_HEADING, _CLOSE_LIST, _CLOSE_LINK = range(7)
+
+
+def _push_children(stack: List[Tuple[int, Any, Any]], el: Tag, style: Dict[str, Any]) -> None:
+    """Queue ``el``'s children on the work stack so they pop in document order."""
+    stack.extend([(_ENTER, child, style) for child in reversed(el.contents)])
+
+
+def _freeze(value: Any) -> Any:
+    """Turn a (nested) style dict into a hashable key, independent of key order."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
 
 
 class RichTextParser:
-    def __init__(self):
+    def __init__(self) -> None:
         self.current_index = 1  # Start at 1 (Google Docs typically has newline at 0)
         self.requests: List[Dict[str, Any]] = []
+        self._pending_text: List[str] = []
+        self._pending_style: Dict[str, Any] = {}
+        self._pending_start = self.current_index
+        # Whether the last request was an insertText ending in a newline; requests[-1] can't
+        # tell, since a run's updateTextStyle now follows its paragraph newline.
+        self._last_inserted_newline = False
+        # Interned text styles: identical formatting shares one dict (and its fields mask).
+        self._style_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._style_fields: Dict[int, str] = {}
+        self._plain_style = self._intern_style(dict(_STYLE_PLAIN))
+        self._tag_styles = {tag: self._intern_style(dict(shape)) for tag, shape in _TAG_STYLES.items()}
+
+    def _intern_style(self, style: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the canonical dict for ``style``; callers must treat it as read-only.
+
+        Every style that reaches a request goes through here, so its ``fields`` mask can be
+        read from ``_style_fields`` instead of being joined per run.
+        """
+        key = _freeze(style)
+        cached = self._style_cache.get(key)
+        if cached is None:
+            cached = self._style_cache[key] = style
+            # Interned dicts live as long as the parser, so their ids stay unique.
+            self._style_fields[id(style)] = ",".join(style.keys())
+        return cached
 
     def _parse_color(self, color: str) -> Optional[Dict[str, Any]]:
         """Convert CSS color to Google Docs color format."""
-        try:
-            # Handle named colors - expanded list
-            NAMED_COLORS = {
-                "red": {"color": {"rgbColor": {"red": 1, "green": 0, "blue": 0}}},
-                "blue": {"color": {"rgbColor": {"red": 0, "green": 0, "blue": 1}}},
-                "green": {"color": {"rgbColor": {"red": 0, "green": 0.5, "blue": 0}}},
-                "yellow": {"color": {"rgbColor": {"red": 1, "green": 1, "blue": 0}}},
-                "orange": {"color": {"rgbColor": {"red": 1, "green": 0.647, "blue": 0}}},
-                "purple": {"color": {"rgbColor": {"red": 0.5, "green": 0, "blue": 0.5}}},
-                "pink": {"color": {"rgbColor": {"red": 1, "green": 0.753, "blue": 0.796}}},
-                "black": {"color": {"rgbColor": {"red": 0, "green": 0, "blue": 0}}},
-                "white": {"color": {"rgbColor": {"red": 1, "green": 1, "blue": 1}}},
-                "gray": {"color": {"rgbColor": {"red": 0.5, "green": 0.5, "blue": 0.5}}},
-                "grey": {"color": {"rgbColor": {"red": 0.5, "green": 0.5, "blue": 0.5}}},
-            }
-            if color.lower() in NAMED_COLORS:
-                return NAMED_COLORS[color.lower()]
-
-            # Handle hex colors
-            if color.startswith("#"):
-                color = color.lstrip("#")
-                if len(color) == 3:
-                    color = "".join(c + c for c in color)
-                r, g, b = [int(color[i:i+2], 16) / 255 for i in (0, 2, 4)]
-                return {
-                    "color": {
-                        "rgbColor": {
-                            "red": r,
-                            "green": g,
-                            "blue": b
-                        }
-                    }
-                }
-
-            # Handle rgb/rgba
-            rgb_match = re.match(r'rgba?\((\d+),\s*(\d+),\s*(\d+)(?:,\s*[\d.]+)?\)', color)
-            if rgb_match:
-                r, g, b = [int(x) / 255 for x in rgb_match.groups()]
-                return {
-                    "color": {
-                        "rgbColor": {
-                            "red": r,
-                            "green": g,
-                            "blue": b
-                        }
-                    }
-                }
-        except Exception:
-            pass
-        return None
+        rgb = _parse_css_color(color)
+        if rgb is None:
+            return None
+        # Built fresh each call: callers may mutate the returned style dicts.
+        return _rgb_to_gdoc(rgb)
 
-    def _get_text_style(self, el: Tag, parent_style: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _get_text_style(self, el: Tag, parent_style: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Extract text style information from HTML element."""
         style: Dict[str, Any] = {}
-        
+        # Read each attribute once; bs4's Tag.get goes through a method call every time.
+        attrs = el.attrs
+        name = el.name
+        style_attr = attrs.get('style') or ''
+
+        # Fast path: most elements carry no inline styling at all.
+        if not style_attr and 'color' not in attrs and 'bgcolor' not in attrs:
+            if name in _STYLE_NEUTRAL_TAGS:
+                return parent_style or self._plain_style
+            if not parent_style and name in self._tag_styles:
+                return self._tag_styles[name]
+
         # Start with parent style
         if parent_style:
             style.update(parent_style)
         
+        # Inline CSS flags; markdown-generated HTML has no style attributes, so skip
+        # the substring tests and regexes entirely in that case.
+        css_bold = css_italic = css_underline = css_strike = False
+        if style_attr:
+            if 'font-weight' in style_attr:
+                weight_match = _RE_FONT_WEIGHT.search(style_attr)
+                css_bold = bool(weight_match) and weight_match.group(1) in ('bold', 'bolder', '700', '800', '900')
+            css_italic = 'font-style' in style_attr and 'italic' in style_attr
+            if 'text-decoration' in style_attr:
+                css_underline = 'underline' in style_attr
+                css_strike = 'line-through' in style_attr
+
         # Bold - check tag name and inline style
-        if el.name in ['b', 'strong']:
+        if css_bold or name in ('b', 'strong'):
             style["bold"] = True
-        elif 'font-weight' in el.get('style', ''):
-            weight_match = re.search(r'font-weight:\s*(\w+|\d+)', el.get('style', ''))
-            if weight_match:
-                weight = weight_match.group(1)
-                if weight in ['bold', 'bolder', '700', '800', '900']:
-                    style["bold"] = True
-        
+
         # Italic
-        if el.name in ['i', 'em']:
+        if css_italic or name in ('i', 'em'):
             style["italic"] = True
-        elif 'font-style' in el.get('style', ''):
-            if 'italic' in el.get('style', ''):
-                style["italic"] = True
-        
+
         # Underline
-        if el.name == 'u':
+        if css_underline or name == 'u':
             style["underline"] = True
-        elif 'text-decoration' in el.get('style', ''):
-            if 'underline' in el.get('style', ''):
-                style["underline"] = True
-        
+
         # Strikethrough
-        if el.name in ['s', 'strike', 'del']:
+        if css_strike or name in ('s', 'strike', 'del'):
             style["strikethrough"] = True
-        elif 'text-decoration' in el.get('style', ''):
-            if 'line-through' in el.get('style', ''):
-                style["strikethrough"] = True
-        
+
         # Subscript and Superscript
-        if el.name == 'sub':
+        if name == 'sub':
             style["baselineOffset"] = "SUBSCRIPT"
-        elif el.name == 'sup':
+        elif name == 'sup':
             style["baselineOffset"] = "SUPERSCRIPT"
         
         # Code/monospace
-        if el.name in ['code', 'pre', 'tt', 'kbd', 'samp']:
+        if name in ('code', 'pre', 'tt', 'kbd', 'samp'):
             style["weightedFontFamily"] = {"fontFamily": "Courier New"}
         
-        # Font family from style
-        if 'font-family' in el.get('style', ''):
-            font = re.search(r'font-family:\s*([^;]+)', el.get('style', ''))
-            if font:
-                font_name = font.group(1).strip().strip('"\'').split(',')[0]
-                style["weightedFontFamily"] = {"fontFamily": font_name}
-        
-        # Font size
-        if 'font-size' in el.get('style', ''):
-            # Try to extract pt size
-            size_pt = re.search(r'font-size:\s*(\d+(?:\.\d+)?)pt', el.get('style', ''))
-            if size_pt:
-                style["fontSize"] = {"magnitude": float(size_pt.group(1)), "unit": "PT"}
-            else:
-                # Try px size (convert to pt: 1pt = 1.333px)
-                size_px = re.search(r'font-size:\s*(\d+(?:\.\d+)?)px', el.get('style', ''))
-                if size_px:
-                    pt_size = float(size_px.group(1)) * 0.75
-                    style["fontSize"] = {"magnitude": pt_size, "unit": "PT"}
-        
+        if style_attr:
+            # Font family from style
+            if 'font-family' in style_attr:
+                font = _RE_FONT_FAMILY.search(style_attr)
+                if font:
+                    font_name = font.group(1).strip().strip('"\'').split(',')[0]
+                    style["weightedFontFamily"] = {"fontFamily": font_name}
+
+            # Font size
+            if 'font-size' in style_attr:
+                # Try to extract pt size
+                size_pt = _RE_FONT_SIZE_PT.search(style_attr)
+                if size_pt:
+                    style["fontSize"] = {"magnitude": float(size_pt.group(1)), "unit": "PT"}
+                else:
+                    # Try px size (convert to pt: 1pt = 1.333px)
+                    size_px = _RE_FONT_SIZE_PX.search(style_attr)
+                    if size_px:
+                        pt_size = float(size_px.group(1)) * 0.75
+                        style["fontSize"] = {"magnitude": pt_size, "unit": "PT"}
+
         # Handle heading tags with default sizes
-        if el.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            # Google Docs heading sizes (approximate)
-            heading_sizes = {
-                'h1': 20,
-                'h2': 16,
-                'h3': 14,
-                'h4': 12,
-                'h5': 11,
-                'h6': 11
-            }
+        if name in _HEADING_SIZES:
             if "fontSize" not in style:
-                style["fontSize"] = {"magnitude": heading_sizes[el.name], "unit": "PT"}
+                style["fontSize"] = {"magnitude": _HEADING_SIZES[name], "unit": "PT"}
             style["bold"] = True
         
         # Color (foreground)
         color = None
-        if 'color' in el.get('style', ''):
-            color_match = re.search(r'color:\s*([^;]+)', el.get('style', ''))
+        if 'color' in style_attr:
+            color_match = _RE_COLOR.search(style_attr)
             if color_match:
                 color = self._parse_color(color_match.group(1).strip())
-        elif el.get('color'):
-            color = self._parse_color(el.get('color'))
+        elif attrs.get('color'):
+            color = self._parse_color(attrs['color'])
             
         if color:
             style["foregroundColor"] = color
 
         # Background color
         bg_color = None
-        if 'background-color' in el.get('style', ''):
-            bg_match = re.search(r'background-color:\s*([^;]+)', el.get('style', ''))
+        if 'background-color' in style_attr:
+            bg_match = _RE_BACKGROUND_COLOR.search(style_attr)
             if bg_match:
                 bg_color = self._parse_color(bg_match.group(1).strip())
-        elif el.get('bgcolor'):
-            bg_color = self._parse_color(el.get('bgcolor'))
+        elif attrs.get('bgcolor'):
+            bg_color = self._parse_color(attrs['bgcolor'])
             
         if bg_color:
             style["backgroundColor"] = bg_color
         
         # Handle <mark> tag for highlighting
-        if el.name == 'mark':
+        if name == 'mark':
             if "backgroundColor" not in style:
                 style["backgroundColor"] = self._parse_color("#ffff00")  # Yellow highlight
 
-        return style
+        return self._intern_style(style)
+
+    def _process_text_with_style(self, text: str, style: Dict[str, Any], is_block_end: bool = False) -> None:
+        """Add text with its style to requests.
 
-    def _process_text_with_style(self, text: str, style: Dict[str, Any], is_block_end: bool = False):
-        """Add text with its style to requests."""
+        Consecutive runs sharing a style are buffered and emitted as a single
+        ``insertText``/``updateTextStyle`` pair when the style changes, a block ends,
+        or another request needs to be appended.
+        """
         if not text and not is_block_end:
             return
 
         # Don't strip text - preserve spacing for inline formatting
-        text_to_insert = text + ("\n" if is_block_end else "")
-        if not text_to_insert:
-            text_to_insert = "\n"
+        if text:
+            pending_style = self._pending_style
+            if self._pending_text and style is not pending_style and style != pending_style:
+                self._flush_pending()
+            if not self._pending_text:
+                self._pending_start = self.current_index
+                self._pending_style = style
+            self._pending_text.append(text)
+            self.current_index += len(text)
+
+        if is_block_end:
+            self._flush_pending(block_end=True)
+            if text and style:
+                # A styled run carrying its own newline (e.g. a rule) has always been followed
+                # by its style update, which closing tags treat as an open paragraph.
+                self._last_inserted_newline = False
+
+    def _flush_pending(self, block_end: bool = False) -> None:
+        """Emit the buffered text run, optionally terminated by a paragraph newline."""
+        text = "".join(self._pending_text)
+        if not text and not block_end:
+            return
 
-        text_request = {
+        start = self._pending_start if text else self.current_index
+        self.requests.append({
             "insertText": {
-                "location": {"index": self.current_index},
-                "text": text_to_insert
+                "location": {"index": start},
+                "text": text + "\n" if block_end else text
             }
-        }
-        self.requests.append(text_request)
+        })
 
         # Apply style to the actual text content (excluding newline)
-        if style and len(text) > 0:
-            style_request = {
+        style = self._pending_style
+        styled = bool(style and text)
+        # A block end closes the paragraph whatever the run's style; otherwise the run only
+        # counts when no style update follows it.
+        self._last_inserted_newline = block_end or (not styled and text.endswith("\n"))
+        if styled:
+            self.requests.append({
                 "updateTextStyle": {
                     "range": {
-                        "startIndex": self.current_index,
-                        "endIndex": self.current_index + len(text)
+                        "startIndex": start,
+                        "endIndex": start + len(text)
                     },
                     "textStyle": style,
-                    "fields": ",".join(style.keys())
+                    "fields": self._style_fields[id(style)]
                 }
-            }
-            self.requests.append(style_request)
-
-        self.current_index += len(text_to_insert)
-
-    def _process_element(self, el: Tag, parent_style: Dict[str, Any] = None):
-        """Process an HTML element and its children recursively."""
-        if not isinstance(el, Tag):
-            # Text node - preserve spaces but don't strip leading/trailing within inline context
-            text = str(el)
-            # Only strip if this text is standalone (not between inline elements)
-            if text.strip():
-                self._process_text_with_style(text, parent_style or {})
-            return
+            })
 
+        if block_end:
+            self.current_index += 1
+        self._pending_text = []
+        self._pending_style = {}
+
+    def _add_request(self, request: Dict[str, Any]) -> None:
+        """Append a non-text request after any buffered text it may refer to."""
+        self._flush_pending()
+        self.requests.append(request)
+        self._last_inserted_newline = False
+
+    def _ends_with_newline(self) -> bool:
+        """Return whether the last inserted text closed a paragraph."""
+        self._flush_pending()
+        return self._last_inserted_newline
+
+    def _process_element(self, el: Tag, parent_style: Optional[Dict[str, Any]] = None) -> None:
+        """Process an HTML element and its children.
+
+        The tree is walked with an explicit stack rather than recursion: an element's
+        children are pushed in reverse, below a closing action that runs once they have
+        all been emitted (paragraph styles, bullets, links, trailing newlines).
+        """
+        stack: List[Tuple[int, Any, Any]] = [(_ENTER, el, parent_style)]
+        pop = stack.pop
+        while stack:
+            action, node, arg = pop()
+            if action == _ENTER:
+                if isinstance(node, Tag):
+                    self._enter_element(node, arg, stack)
+                    continue
+                # Text node, handled inline: it carries the style its ancestors accumulated,
+                # and adjacent runs sharing it are fused by the text buffer. Preserve spaces
+                # but don't strip leading/trailing within inline context
+                text = str(node)
+                # Only strip if this text is standalone (not between inline elements)
+                if text.strip():
+                    self._process_text_with_style(text, arg or {})
+            elif action == _BLOCK_END:
+                self._process_text_with_style("", {}, is_block_end=True)
+            elif action == _CLOSE_BLOCK:
+                if not self._ends_with_newline():
+                    self._process_text_with_style("", {}, is_block_end=True)
+            elif action == _CLOSE_DIV:
+                # Stop at the first non-blank string instead of joining the whole subtree's
+                # text; nested divs would otherwise re-walk their descendants once per level.
+                if next(node.stripped_strings, None) is not None and not self._ends_with_newline():
+                    self._process_text_with_style("", {}, is_block_end=True)
+            elif action == _CLOSE_HEADING:
+                # Add newline if not already there
+                if not self._ends_with_newline():
+                    self._process_text_with_style("", {}, is_block_end=True)
+
+                # Apply paragraph style
+                self._add_request({
+                    "updateParagraphStyle": {
+                        "range": {
+                            "startIndex": arg,
+                            "endIndex": self.current_index
+                        },
+                        "paragraphStyle": {"namedStyleType": f"HEADING_{node}"},
+                        "fields": "namedStyleType"
+                    }
+                })
+            elif action == _CLOSE_LIST:
+                self._add_request({
+                    "createParagraphBullets": {
+                        "range": {
+                            "startIndex": arg,
+                            "endIndex": self.current_index
+                        },
+                        "bulletPreset": "NUMBERED_DECIMAL_ALPHA_ROMAN" if node == "ol" else "BULLET_DISC_CIRCLE_SQUARE"
+                    }
+                })
+            elif action == _CLOSE_LINK:
+                href, current_style = node
+                # Apply link styling if there's a valid href
+                if self.current_index > arg:
+                    link_style = current_style.copy()
+                    link_style["link"] = {"url": href}
+                    link_style["underline"] = True
+                    link_style["foregroundColor"] = self._parse_color("#0563C1")  # Standard link blue
+                    link_style = self._intern_style(link_style)
+
+                    self._add_request({
+                        "updateTextStyle": {
+                            "range": {
+                                "startIndex": arg,
+                                "endIndex": self.current_index
+                            },
+                            "textStyle": link_style,
+                            "fields": self._style_fields[id(link_style)]
+                        }
+                    })
+
+    def _enter_element(self, el: Tag, parent_style: Optional[Dict[str, Any]], stack: List[Tuple[int, Any, Any]]) -> None:
+        """Handle one element for ``_process_element``, pushing its children and closing action."""
         # Get current element's style merged with parent
         current_style = self._get_text_style(el, parent_style)
+        name = el.name
 
         # Handle block elements
-        if el.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            level = int(el.name[1])
-            # Process children with heading style
-            start_index = self.current_index
-            for child in el.children:
-                self._process_element(child, current_style)
-            
-            # Add newline if not already there
-            if not self.requests or not self.requests[-1].get('insertText', {}).get('text', '').endswith('\n'):
-                self._process_text_with_style("", {}, is_block_end=True)
-            
-            # Apply paragraph style
-            self.requests.append({
-                "updateParagraphStyle": {
-                    "range": {
-                        "startIndex": start_index,
-                        "endIndex": self.current_index
-                    },
-                    "paragraphStyle": {"namedStyleType": f"HEADING_{level}"},
-                    "fields": "namedStyleType"
-                }
-            })
+        if name in _HEADING_SIZES:
+            # Process children with heading style, then close the paragraph
+            stack.append((_CLOSE_HEADING, int(name[1]), self.current_index))
+            _push_children(stack, el, current_style)
             return
 
-        if el.name == 'p':
-            for child in el.children:
-                self._process_element(child, current_style)
-            self._process_text_with_style("", {}, is_block_end=True)
+        if name == 'p':
+            stack.append((_BLOCK_END, None, None))
+            _push_children(stack, el, current_style)
             return
 
-        if el.name == 'br':
+        if name == 'br':
             self._process_text_with_style("", {}, is_block_end=True)
             return
 
-        if el.name == 'hr':
+        if name == 'hr':
             # Insert a horizontal line using a special character
             self._process_text_with_style("___", current_style, is_block_end=True)
             return
 
-        if el.name in ['ul', 'ol']:
-            list_items = el.find_all('li', recursive=False)
-            list_start_index = self.current_index
-            for item in list_items:
-                for child in item.children:
-                    self._process_element(child, current_style)
-                self._process_text_with_style("", {}, is_block_end=True)
-            
+        if name in ('ul', 'ol'):
+            list_items = _child_tags(el, ('li',))
             if list_items:
-                self.requests.append({
-                    "createParagraphBullets": {
-                        "range": {
-                            "startIndex": list_start_index,
-                            "endIndex": self.current_index
-                        },
-                        "bulletPreset": "NUMBERED_DECIMAL_ALPHA_ROMAN" if el.name == "ol" else "BULLET_DISC_CIRCLE_SQUARE"
-                    }
-                })
+                stack.append((_CLOSE_LIST, name, self.current_index))
+            for item in reversed(list_items):
+                stack.append((_BLOCK_END, None, None))
+                _push_children(stack, item, current_style)
             return
 
         # Handle blockquote
-        if el.name == 'blockquote':
-            for child in el.children:
-                self._process_element(child, current_style)
-            if not self.requests or not self.requests[-1].get('insertText', {}).get('text', '').endswith('\n'):
-                self._process_text_with_style("", {}, is_block_end=True)
+        if name == 'blockquote':
+            stack.append((_CLOSE_BLOCK, None, None))
+            _push_children(stack, el, current_style)
             return
 
         # Handle div and span as style containers
-        if el.name in ['div', 'span', 'section', 'article']:
-            for child in el.children:
-                self._process_element(child, current_style)
+        if name in ('div', 'span', 'section', 'article'):
             # Only add newline for block-level divs
-            if el.name in ['div', 'section', 'article']:
-                if el.get_text(strip=True) and not self.requests[-1].get('insertText', {}).get('text', '').endswith('\n'):
-                    self._process_text_with_style("", {}, is_block_end=True)
+            if name != 'span':
+                stack.append((_CLOSE_DIV, el, None))
+            _push_children(stack, el, current_style)
             return
 
         # Handle anchor tags
-        if el.name == 'a':
+        if name == 'a':
             href = el.get('href', '')
-            start_index = self.current_index
-            for child in el.children:
-                self._process_element(child, current_style)
-            
-            # Apply link styling if there's a valid href
-            if href and self.current_index > start_index:
-                link_style = current_style.copy()
-                link_style["link"] = {"url": href}
-                link_style["underline"] = True
-                link_style["foregroundColor"] = self._parse_color("#0563C1")  # Standard link blue
-                
-                self.requests.append({
-                    "updateTextStyle": {
-                        "range": {
-                            "startIndex": start_index,
-                            "endIndex": self.current_index
-                        },
-                        "textStyle": link_style,
-                        "fields": ",".join(link_style.keys())
-                    }
-                })
+            if href:
+                stack.append((_CLOSE_LINK, (href, current_style), self.current_index))
+            _push_children(stack, el, current_style)
             return
         
         # Handle images
-        if el.name == 'img':
+        if name == 'img':
             src = el.get('src', '')
-            alt = el.get('alt', '')
-            
+
             if src:
                 # Get image dimensions if specified
                 width = el.get('width')
@@ -350,41 +538,33 @@ class RichTextParser:
                 # Add size if specified
                 if width or height:
                     object_size = {}
-                    if width:
-                        try:
-                            width_val = float(re.sub(r'[^\d.]', '', str(width)))
-                            object_size["width"] = {"magnitude": width_val, "unit": "PT"}
-                        except ValueError:
-                            pass
-                    if height:
-                        try:
-                            height_val = float(re.sub(r'[^\d.]', '', str(height)))
-                            object_size["height"] = {"magnitude": height_val, "unit": "PT"}
-                        except ValueError:
-                            pass
-                    
+                    for dimension, value in (("width", width), ("height", height)):
+                        magnitude = _parse_dimension(value) if value else None
+                        if magnitude is not None:
+                            object_size[dimension] = {"magnitude": magnitude, "unit": "PT"}
+
                     if object_size:
                         image_request["insertInlineImage"]["objectSize"] = object_size
                 
-                self.requests.append(image_request)
+                self._add_request(image_request)
                 self.current_index += 1  # Images take up one character position
             return
 
         # Handle table
-        if el.name == 'table':
-            rows = el.find_all('tr', recursive=False)
+        if name == 'table':
+            rows = _child_tags(el, ('tr',))
             if not rows:
-                tbody = el.find('tbody')
-                if tbody:
-                    rows = tbody.find_all('tr', recursive=False)
-            
+                for tbody in _child_tags(el, ('tbody',)):
+                    rows = _child_tags(tbody, ('tr',))
+                    break
+
             if rows:
-                cols = max(len(row.find_all(['td', 'th'], recursive=False)) for row in rows)
+                cols = max(len(_child_tags(row, ('td', 'th'))) for row in rows)
                 if cols > 0:
                     table_start_index = self.current_index
                     self._process_text_with_style("", {}, is_block_end=True)
                     
-                    self.requests.append({
+                    self._add_request({
                         "insertTable": {
                             "rows": len(rows),
                             "columns": cols,
@@ -399,14 +579,16 @@ class RichTextParser:
             return
 
         # Default: process children with current style
-        for child in el.children:
-            self._process_element(child, current_style)
+        _push_children(stack, el, current_style)
 
     def parse_html(self, html: str) -> List[Dict[str, Any]]:
         """Parse HTML into Google Docs API requests with rich text formatting."""
         self.current_index = 1
         self.requests = []
-        
+        self._pending_text = []
+        self._pending_style = {}
+        self._last_inserted_newline = False
+
         soup = BeautifulSoup(html, "html.parser")
         
         # Process body content if exists, otherwise process all top-level elements
@@ -419,30 +601,56 @@ class RichTextParser:
             for el in soup.children:
                 if isinstance(el, Tag):
                     self._process_element(el)
-            
+
+        self._flush_pending()
         return self.requests
 
 
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_html_cached(html: str) -> bytes:
+    return fastjson.dumps(RichTextParser().parse_html(html))
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_markdown_cached(md: str) -> bytes:
+    html = _get_markdown().reset().convert(md)
+    return fastjson.dumps(RichTextParser().parse_html(html))
+
+
 def parse_html_to_docs_sync(html: str) -> List[Dict[str, Any]]:
     """Convert HTML to Google Docs API requests, preserving rich text formatting."""
-    parser = RichTextParser()
-    return parser.parse_html(html or "")
+    html = html or ""
+    if len(html) > _PARSE_CACHE_MAX_INPUT:
+        return RichTextParser().parse_html(html)
+    return fastjson.loads(_parse_html_cached(html))
+
+
+def _get_markdown() -> markdown.Markdown:
+    """Return this thread's Markdown converter, building the extension pipeline once."""
+    converter = getattr(_markdown_local, "converter", None)
+    if converter is None:
+        converter = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+        _markdown_local.converter = converter
+    return converter
 
 
 def parse_markdown_to_docs_sync(md: str) -> List[Dict[str, Any]]:
     """Convert Markdown to HTML, then to Google Docs API requests."""
-    html = markdown.markdown(md or "", extensions=['extra', 'nl2br', 'sane_lists'])
-    return parse_html_to_docs_sync(html)
+    md = md or ""
+    if len(md) > _PARSE_CACHE_MAX_INPUT:
+        html = _get_markdown().reset().convert(md)
+        return RichTextParser().parse_html(html)
+    return fastjson.loads(_parse_markdown_cached(md))
 
 
 # Keep async versions for compatibility
-async def parse_html(html: str):
+async def parse_html(html: str) -> List[Dict[str, Any]]:
     """Async wrapper for HTML parsing (simplified version for compatibility)."""
     await asyncio.sleep(0)
     return parse_html_to_docs_sync(html)
 
 
-async def parse_markdown(md: str):
+async def parse_markdown(md: str) -> List[Dict[str, Any]]:
     """Async wrapper for Markdown parsing (simplified version for compatibility)."""
     await asyncio.sleep(0)
     return parse_markdown_to_docs_sync(md)
\ No newline at end of file
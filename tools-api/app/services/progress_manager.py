@@ -2,64 +2,79 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import threading
+from collections import deque
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Dict
 
+from app.utils import fastjson
 from app.utils.logger import logger
 
 
 @dataclass
 class _ProgressChannel:
-    """Container holding the queue and loop associated with a job."""
+    """Pending events for a job plus the signal that wakes its listener.
 
-    queue: "asyncio.Queue[dict[str, Any] | None]"
+    A job has a single listener, so a deque and an event replace ``asyncio.Queue``.
+    Producers append from any thread (deque appends are atomic) and only bounce onto
+    the loop to set the signal; ``None`` marks the end of the stream.
+    """
+
+    events: "deque[dict[str, Any] | None]"
+    signal: asyncio.Event
     loop: asyncio.AbstractEventLoop
 
+    def push(self, payload: dict[str, Any] | None) -> None:
+        self.events.append(payload)
+        # The listener re-checks the deque after clearing the signal, so skipping the
+        # wake-up while it is still set cannot strand an event.
+        if not self.signal.is_set():
+            self.loop.call_soon_threadsafe(self.signal.set)
+
 
 class ProgressManager:
     """Tracks progress events for yt-dlp downloads and exposes them via SSE."""
 
     def __init__(self) -> None:
         self._channels: dict[str, _ProgressChannel] = {}
+        # Guards inserts and removals only; single dict reads are atomic, so publish()
+        # looks channels up without taking it.
         self._lock = threading.Lock()
 
-    def ensure_channel(self, job_id: str) -> asyncio.Queue[dict[str, Any] | None]:
-        """Ensure a progress queue exists for the supplied job ID."""
+    def ensure_channel(self, job_id: str) -> _ProgressChannel:
+        """Ensure a progress channel exists for the supplied job ID."""
 
         if not job_id:
             raise ValueError("job_id must be a non-empty string")
 
+        channel = self._channels.get(job_id)
+        if channel:
+            return channel
+
         loop = asyncio.get_running_loop()
 
         with self._lock:
             channel = self._channels.get(job_id)
             if channel:
-                return channel.queue
+                return channel
 
-            queue: "asyncio.Queue[dict[str, Any] | None]" = asyncio.Queue()
-            self._channels[job_id] = _ProgressChannel(queue=queue, loop=loop)
+            channel = _ProgressChannel(events=deque(), signal=asyncio.Event(), loop=loop)
+            self._channels[job_id] = channel
             logger.debug("Created progress channel for job %s", job_id)
-            return queue
+            return channel
 
     def publish(self, job_id: str, payload: Dict[str, Any]) -> None:
-        """Publish a progress payload to the queue for the supplied job ID."""
+        """Publish a progress payload to the channel for the supplied job ID."""
 
         if not job_id:
             return
 
-        with self._lock:
-            channel = self._channels.get(job_id)
-
+        channel = self._channels.get(job_id)
         if not channel:
             logger.debug("Discarding progress update for %s - no active listeners", job_id)
             return
 
-        def _push() -> None:
-            channel.queue.put_nowait(payload)
-
-        channel.loop.call_soon_threadsafe(_push)
+        channel.push(payload)
 
     def close(self, job_id: str) -> None:
         """Signal that no further updates will be published for the job ID."""
@@ -74,29 +89,33 @@ class ProgressManager:
             return
 
         logger.debug("Closing progress channel for job %s", job_id)
-
-        def _close() -> None:
-            channel.queue.put_nowait(None)
-
-        channel.loop.call_soon_threadsafe(_close)
+        channel.push(None)
 
     async def iter_events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
         """Yield progress events for the supplied job ID until the channel closes."""
 
-        queue = self.ensure_channel(job_id)
+        channel = self.ensure_channel(job_id)
+        events, signal = channel.events, channel.signal
 
         while True:
-            payload = await queue.get()
-            if payload is None:
-                break
-            yield payload
+            while events:
+                payload = events.popleft()
+                if payload is None:
+                    return
+                yield payload
+
+            signal.clear()
+            if not events:
+                await signal.wait()
 
     @staticmethod
-    def format_sse(payload: Dict[str, Any]) -> str:
-        """Convert a payload to a string suitable for Server-Sent Events."""
+    def format_sse(payload: Dict[str, Any]) -> bytes:
+        """Convert a payload to an encoded Server-Sent Events frame.
+
+        Returned as UTF-8 bytes so the streaming response writes it without re-encoding.
+        """
 
-        data = json.dumps(payload, ensure_ascii=False)
-        return f"data: {data}\n\n"
+        return b"data: " + fastjson.dumps(payload) + b"\n\n"
 
 
 progress_manager = ProgressManager()
@@ -9,3 +9,12 @@ queue = Queue("default", connection=redis_conn)
 
 def enqueue(func, *args, **kwargs):
     return queue.enqueue(func, *args, **kwargs)
+
+def enqueue_many(specs):
+    """Enqueue ``(func, args, kwargs)`` triples in a single Redis round-trip.
+
+    Calling ``enqueue`` in a loop pays one round-trip per job; rq pipelines these.
+    """
+    return queue.enqueue_many(
+        [Queue.prepare_data(func, args=args, kwargs=kwargs) for func, args, kwargs in specs]
+    )
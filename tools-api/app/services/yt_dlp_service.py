@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import base64
-import io
+import contextlib
 import json
 import mimetypes
 import tempfile
 import zipfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List
 
@@ -20,12 +20,29 @@ class YtDlpServiceError(RuntimeError):
 
 @dataclass
 class DownloadResult:
-    """Container for downloaded binary payloads."""
+    """Downloaded payload left on disk so it can be moved or streamed, never buffered.
 
-    content: bytes
+    The file lives in a temporary directory owned by the result; call :meth:`close`
+    (or use the result as a context manager) once the file has been consumed.
+    """
+
+    path: Path
+    size: int
     filename: str
     content_type: str
     metadata: Dict[str, Any]
+    resources: contextlib.ExitStack = field(default_factory=contextlib.ExitStack, repr=False)
+
+    def close(self) -> None:
+        """Remove the temporary directory holding the download."""
+
+        self.resources.close()
+
+    def __enter__(self) -> "DownloadResult":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 SUBTITLE_EXTENSIONS = {".vtt", ".srt", ".ass", ".lrc", ".ttml", ".json"}
@@ -91,13 +108,19 @@ class YtDlpService:
         options: Dict[str, Any],
         filename_override: str | None = None,
         progress_callback: Callable[[Dict[str, Any]], None] | None = None,
+        info: Dict[str, Any] | None = None,
     ) -> DownloadResult:
-        """Download the media payload and return the bytes plus metadata."""
+        """Download the media payload and return the file on disk plus metadata.
+
+        When *info* from an earlier :meth:`extract_info` call is supplied it is processed
+        directly, like yt-dlp's ``--load-info-json``, so the page is not extracted again.
+        """
 
         yt_dlp = _ensure_yt_dlp()
 
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_path = Path(tmp_dir)
+        resources = contextlib.ExitStack()
+        try:
+            tmp_path = Path(resources.enter_context(tempfile.TemporaryDirectory()))
             hook_wrappers = []
             requested_options = dict(options)
             existing_hooks = requested_options.pop("progress_hooks", None)
@@ -132,7 +155,7 @@ class YtDlpService:
             logger.debug("Downloading media via yt-dlp for %s with options %s", url, merged_options)
             try:
                 with yt_dlp.YoutubeDL(merged_options) as ydl:
-                    info = ydl.extract_info(url, download=True)
+                    info = self._download_with_info(ydl, url, info)
             except Exception as exc:  # pragma: no cover - yt-dlp raises many custom errors
                 logger.error("yt-dlp download failed: %s", exc)
                 raise YtDlpServiceError(str(exc)) from exc
@@ -148,12 +171,29 @@ class YtDlpService:
                 raise YtDlpServiceError("yt-dlp reported a downloaded file that could not be found")
 
             filename = filename_override or path.name
-            content = path.read_bytes()
             content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
 
             metadata = self._serializable_metadata(info)
 
-            return DownloadResult(content=content, filename=filename, content_type=content_type, metadata=metadata)
+            return DownloadResult(
+                path=path,
+                size=path.stat().st_size,
+                filename=filename,
+                content_type=content_type,
+                metadata=metadata,
+                resources=resources,
+            )
+        except BaseException:
+            resources.close()
+            raise
+
+    def _download_with_info(self, ydl: Any, url: str, info: Dict[str, Any] | None) -> Dict[str, Any]:
+        if info is not None:
+            try:
+                return ydl.process_ie_result(ydl.sanitize_info(info), download=True)
+            except Exception as exc:  # pragma: no cover - e.g. expired format URLs
+                logger.info("Could not reuse yt-dlp info for %s (%s); extracting again", url, exc)
+        return ydl.extract_info(url, download=True)
 
     def download_subtitles(
         self,
@@ -166,8 +206,9 @@ class YtDlpService:
 
         yt_dlp = _ensure_yt_dlp()
 
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_path = Path(tmp_dir)
+        resources = contextlib.ExitStack()
+        try:
+            tmp_path = Path(resources.enter_context(tempfile.TemporaryDirectory()))
             merged_options = self._build_options(
                 {
                     "skip_download": True,
@@ -190,17 +231,16 @@ class YtDlpService:
                 raise YtDlpServiceError("No subtitles were downloaded for this request")
 
             if len(subtitle_files) == 1:
-                subtitle_path = subtitle_files[0]
-                filename = filename_override or subtitle_path.name
-                content = subtitle_path.read_bytes()
+                path = subtitle_files[0]
+                filename = filename_override or path.name
                 content_type = mimetypes.guess_type(filename)[0] or "text/plain"
             else:
-                archive = io.BytesIO()
-                with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+                # Archive to disk next to the tracks so the result is handled like any file.
+                path = tmp_path / "subtitles.zip"
+                with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
                     for subtitle_path in subtitle_files:
                         zip_file.write(subtitle_path, arcname=subtitle_path.name)
                 filename = filename_override or "subtitles.zip"
-                content = archive.getvalue()
                 content_type = "application/zip"
 
             metadata = self._serializable_metadata(info)
@@ -211,7 +251,17 @@ class YtDlpService:
                 }
             )
 
-            return DownloadResult(content=content, filename=filename, content_type=content_type, metadata=metadata)
+            return DownloadResult(
+                path=path,
+                size=path.stat().st_size,
+                filename=filename,
+                content_type=content_type,
+                metadata=metadata,
+                resources=resources,
+            )
+        except BaseException:
+            resources.close()
+            raise
 
     def _collect_subtitle_files(self, directory: Path) -> List[Path]:
         files: List[Path] = []
@@ -0,0 +1,42 @@
+"""JSON helpers backed by orjson when it is installed.
+
+Both functions work with UTF-8 bytes so callers can skip the ``str``
+round-trip. Without orjson they fall back to the standard library and
+produce the same compact output.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:  # pragma: no cover - depends on the environment
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both.
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON, stringifying unsupported values."""
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(
+        obj, ensure_ascii=False, default=str, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse JSON from ``str`` or UTF-8 ``bytes``."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+__all__ = ["JSONDecodeError", "dumps", "loads"]
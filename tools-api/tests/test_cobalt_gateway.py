@@ -0,0 +1,70 @@
+import asyncio
+
+from app.services.cobalt_gateway import CobaltGateway
+from app.services.cobalt_local_service import LocalProcessResult
+from app.services.cobalt_service import CobaltBinaryResult
+
+
+class SlowLocal:
+    def __init__(self):
+        self.calls = 0
+
+    async def process(self, payload, *, expect_binary, filename_override=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return LocalProcessResult(payload={"url": payload["url"]}, binary=None)
+
+
+def test_identical_concurrent_requests_share_one_backend_call():
+    local = SlowLocal()
+    gateway = CobaltGateway(remote=None, local=local)
+
+    async def run():
+        return await asyncio.gather(
+            gateway.process({"url": "https://example.com/a"}, expect_binary=False),
+            gateway.process({"url": "https://example.com/a"}, expect_binary=False),
+            gateway.process({"url": "https://example.com/b"}, expect_binary=False),
+        )
+
+    first, second, third = asyncio.run(run())
+
+    assert local.calls == 2
+    assert first is second
+    assert third.payload == {"url": "https://example.com/b"}
+    assert gateway._in_flight == {}
+
+    # Once finished, a repeat request runs again rather than reusing a stale result.
+    asyncio.run(gateway.process({"url": "https://example.com/a"}, expect_binary=False))
+    assert local.calls == 3
+
+
+def test_shared_binary_is_cleaned_up_after_the_last_caller(tmp_path):
+    media = tmp_path / "clip.mp4"
+    media.write_bytes(b"media")
+
+    class BinaryLocal(SlowLocal):
+        async def process(self, payload, *, expect_binary, filename_override=None):
+            await super().process(payload, expect_binary=expect_binary)
+            binary = CobaltBinaryResult(
+                filename="clip.mp4",
+                content_type="video/mp4",
+                metadata={},
+                path=media,
+                cleanup=media.unlink,
+            )
+            return LocalProcessResult(payload={}, binary=binary)
+
+    gateway = CobaltGateway(remote=None, local=BinaryLocal())
+
+    async def run():
+        return await asyncio.gather(
+            gateway.process({"url": "https://example.com/a"}, expect_binary=True),
+            gateway.process({"url": "https://example.com/a"}, expect_binary=True),
+        )
+
+    first, second = asyncio.run(run())
+
+    first.binary.release()
+    assert media.exists()
+    second.binary.release()
+    assert not media.exists()
@@ -0,0 +1,127 @@
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.services.cobalt_local_service import LocalCobaltService
+from app.services.yt_dlp_service import DownloadResult
+
+
+class FakeYtDlp:
+    def __init__(self):
+        self.extract_calls = 0
+        self.download_infos = []
+
+    def extract_info(self, url, *, options):
+        self.extract_calls += 1
+        return {"title": "Clip", "webpage_url": url}
+
+    def download(self, url, *, options, filename_override=None, info=None):
+        self.download_infos.append(info)
+        workdir = Path(tempfile.mkdtemp())
+        path = workdir / "clip.mp4"
+        path.write_bytes(b"media")
+        result = DownloadResult(path=path, size=5, filename="clip.mp4", content_type="video/mp4", metadata={})
+        result.resources.callback(shutil.rmtree, workdir)
+        return result
+
+    def _serializable_metadata(self, info):
+        return dict(info)
+
+
+def test_download_reuses_info_from_a_previous_metadata_request():
+    yt_dlp = FakeYtDlp()
+    service = LocalCobaltService(yt_dlp)
+
+    async def run():
+        await service.process({"url": "https://example.com/v"}, expect_binary=False)
+        await service.process({"url": "https://example.com/v"}, expect_binary=True)
+        return await service.process({"url": "https://example.com/other"}, expect_binary=True)
+
+    result = asyncio.run(run())
+
+    assert yt_dlp.extract_calls == 1
+    assert yt_dlp.download_infos == [{"title": "Clip", "webpage_url": "https://example.com/v"}, None]
+    # The download stays on disk until the response serving it releases it.
+    assert result.binary.content is None
+    assert result.binary.path.read_bytes() == b"media"
+    assert result.payload["filesize"] == 5
+    result.binary.acquire().release()
+    assert not result.binary.path.exists()
+
+
+def test_metadata_requests_are_cached_per_url_and_options():
+    yt_dlp = FakeYtDlp()
+    service = LocalCobaltService(yt_dlp)
+
+    async def run():
+        first = await service.process({"url": "https://example.com/v"}, expect_binary=False)
+        second = await service.process({"url": "https://example.com/v"}, expect_binary=False)
+        await service.process({"url": "https://example.com/v", "downloadMode": "audio"}, expect_binary=False)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.payload == second.payload
+    assert yt_dlp.extract_calls == 2
+
+    service.clear_metadata_cache()
+    asyncio.run(service.process({"url": "https://example.com/v"}, expect_binary=False))
+    assert yt_dlp.extract_calls == 3
+
+
+def test_downloads_are_limited_to_the_configured_concurrency():
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    class SlowYtDlp(FakeYtDlp):
+        def download(self, url, **kwargs):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.02)
+            with lock:
+                running["now"] -= 1
+            return super().download(url, **kwargs)
+
+    service = LocalCobaltService(SlowYtDlp(), max_concurrent_downloads=2)
+
+    async def run():
+        requests = [
+            service.process({"url": f"https://example.com/{index}"}, expect_binary=True) for index in range(5)
+        ]
+        return await asyncio.gather(*requests)
+
+    results = asyncio.run(run())
+
+    assert len(results) == 5
+    assert running["peak"] == 2
+    assert service.download_load == {"active": 0, "queued": 0}
+
+
+def test_yt_dlp_runs_share_a_persistent_cache_dir(tmp_path):
+    seen = []
+
+    class RecordingYtDlp(FakeYtDlp):
+        def extract_info(self, url, *, options):
+            seen.append(options.get("cachedir"))
+            return super().extract_info(url, options=options)
+
+    cache_dir = tmp_path / "cache"
+    service = LocalCobaltService(RecordingYtDlp(), cache_dir=cache_dir)
+    asyncio.run(service.process({"url": "https://example.com/v"}, expect_binary=False))
+
+    assert cache_dir.is_dir()
+    assert seen == [str(cache_dir)]
+
+
+def test_resolve_mode_prefers_download_mode_then_preset_keywords():
+    service = LocalCobaltService(FakeYtDlp())
+
+    assert service._resolve_mode({"downloadMode": "Audio", "preset": "youtube-video"}) == "audio"
+    assert service._resolve_mode({"downloadMode": "auto", "preset": "YouTube-Video"}) == "video"
+    assert service._resolve_mode({"preset": "podcast-audio-video"}) == "audio"
+    assert service._resolve_mode({"preset": "misc"}) == "auto"
+    assert service._resolve_mode({}) == "auto"
@@ -0,0 +1,146 @@
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+
+from app.services.cobalt_service import CobaltBinaryResult, CobaltError, CobaltService
+
+
+def test_cobalt_service_reuses_one_client(tmp_path):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, str(request.url), request.headers.get("authorization")))
+        if request.method == "POST":
+            return httpx.Response(200, json={"status": "tunnel", "url": "https://media.example/file.mp4"})
+        return httpx.Response(200, content=b"video", headers={"content-type": "video/mp4"})
+
+    service = CobaltService(
+        base_url="https://cobalt.example/",
+        auth_scheme="Api-Key",
+        auth_token="secret",
+        transport=httpx.MockTransport(handler),
+        download_dir=tmp_path,
+    )
+
+    async def run():
+        data = await service.process({"url": "https://youtu.be/x"})
+        client = service._client
+        binary = await service.download_binary(data)
+        assert service._client is client
+        await service.aclose()
+        assert client.is_closed
+        return binary
+
+    binary = asyncio.run(run())
+
+    # The media is streamed to a temporary file rather than held in memory.
+    assert binary.content is None
+    assert binary.path.parent.parent == tmp_path
+    assert binary.read_bytes() == b"video"
+    assert binary.content_type == "video/mp4"
+    # Serving it once removes the temporary file, so nothing piles up on disk.
+    binary.acquire().release()
+    assert list(tmp_path.iterdir()) == []
+    # Credentials go to the Cobalt API only, not to the media host.
+    assert seen == [
+        ("POST", "https://cobalt.example/", "Api-Key secret"),
+        ("GET", "https://media.example/file.mp4", None),
+    ]
+
+
+def test_binary_result_encodes_metadata_on_demand():
+    binary = CobaltBinaryResult(
+        filename="clip.mp4",
+        content_type="video/mp4",
+        metadata={"title": "Café"},
+        content=b"x",
+    )
+
+    assert binary._encoded_metadata is None
+    assert json.loads(base64.b64decode(binary.encoded_metadata)) == {"title": "Café"}
+
+
+def test_cobalt_service_retries_transient_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(CobaltService, "retry_backoff", 0)
+    attempts = {"POST": 0, "GET": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts[request.method] += 1
+        if attempts[request.method] == 1:
+            if request.method == "POST":
+                return httpx.Response(503, text="overloaded")
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.method == "POST":
+            return httpx.Response(200, json={"status": "redirect", "url": "https://media.example/a.mp4"})
+        return httpx.Response(200, content=b"video")
+
+    service = CobaltService(
+        base_url="https://cobalt.example/",
+        transport=httpx.MockTransport(handler),
+        download_dir=tmp_path,
+    )
+
+    async def run():
+        data = await service.process({"url": "https://youtu.be/x"})
+        return await service.download_binary(data)
+
+    assert asyncio.run(run()).read_bytes() == b"video"
+    assert attempts == {"POST": 2, "GET": 2}
+
+
+def test_cobalt_service_reports_pool_exhaustion_and_client_errors(monkeypatch):
+    monkeypatch.setattr(CobaltService, "retry_backoff", 0)
+    responses = iter([httpx.PoolTimeout("pool full"), httpx.Response(400, text="bad")])
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        outcome = next(responses)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    service = CobaltService(base_url="https://cobalt.example/", transport=httpx.MockTransport(handler))
+
+    with pytest.raises(CobaltError, match="busy"):
+        asyncio.run(service.process({"url": "https://youtu.be/x"}))
+    # Client errors are not retried.
+    with pytest.raises(CobaltError, match="rejected"):
+        asyncio.run(service.process({"url": "https://youtu.be/x"}))
+    assert len(calls) == 2
+
+
+def test_cobalt_download_batches_disk_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.cobalt_service.DOWNLOAD_CHUNK_SIZE", 4)
+    monkeypatch.setattr("app.services.cobalt_service.DOWNLOAD_WRITE_BUFFER_SIZE", 16)
+    payload = bytes(range(50))
+    writes = []
+    to_thread = asyncio.to_thread
+
+    async def counting_to_thread(func, *args, **kwargs):
+        writes.append(len(args[0]))
+        return await to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(200, json={"status": "tunnel", "url": "https://media.example/file.bin"})
+        return httpx.Response(200, content=payload)
+
+    service = CobaltService(
+        base_url="https://cobalt.example/",
+        transport=httpx.MockTransport(handler),
+        download_dir=tmp_path,
+    )
+
+    async def run():
+        data = await service.process({"url": "https://youtu.be/x"})
+        return await service.download_binary(data)
+
+    assert asyncio.run(run()).read_bytes() == payload
+    # 4-byte network chunks are written 16 bytes at a time, plus the remainder.
+    assert writes == [16, 16, 16, 2]
@@ -0,0 +1,78 @@
+import pytest
+
+from app.services.docs_parser_service import GoogleDocsParser
+from app.utils import fastjson
+
+
+def test_parse_docs_json_extracts_text_urls_and_images():
+    docs_json = {
+        "body": {
+            "content": [
+                {
+                    "paragraph": {
+                        "elements": [
+                            {"textRun": {"content": "Read https://example.com/post?id=1 today.\n"}},
+                            {"textRun": {"content": 'Quoted "http://example.org/a" link'}},
+                            {
+                                "inlineObjectElement": {
+                                    "imageProperties": {"sourceUri": "https://images.example/pic.png"}
+                                }
+                            },
+                        ]
+                    }
+                }
+            ]
+        }
+    }
+
+    result = GoogleDocsParser().parse_docs_json(docs_json)
+
+    assert result.urls == ["https://example.com/post?id=1", "http://example.org/a"]
+    assert result.images == ["https://images.example/pic.png"]
+    assert result.text == 'Read today. Quoted " " link'
+
+
+def test_url_stripping_handles_urls_sharing_a_prefix():
+    text, urls = GoogleDocsParser()._extract_urls_from_text(
+        "a http://example.com b http://example.com/deeper c"
+    )
+
+    assert text == "a b c"
+    assert urls == ["http://example.com", "http://example.com/deeper"]
+
+
+def test_parse_docs_json_walks_nested_tables_in_order():
+    def paragraph(text):
+        return {"paragraph": {"elements": [{"textRun": {"content": text}}]}}
+
+    def table(*cells):
+        return {"table": {"tableRows": [{"tableCells": [{"content": list(cell)} for cell in cells]}]}}
+
+    content = [
+        paragraph("one"),
+        table([paragraph("two")], [table([paragraph("three")]), paragraph("four")]),
+        paragraph("five"),
+    ]
+
+    assert GoogleDocsParser().parse_docs_json(content).text == "one two three four five"
+
+
+def test_parse_docs_json_accepts_encoded_payloads():
+    payload = [{"paragraph": {"elements": [{"textRun": {"content": "héllo"}}]}}]
+
+    assert GoogleDocsParser().parse_docs_json(fastjson.dumps(payload)).text == "héllo"
+    assert GoogleDocsParser().parse_docs_json(fastjson.dumps(payload).decode("utf-8")).text == "héllo"
+    with pytest.raises(ValueError):
+        GoogleDocsParser().parse_docs_json("{not json")
+
+
+def test_parse_docs_json_deduplicates_urls_and_images_in_order():
+    def paragraph(text):
+        return {"paragraph": {"elements": [{"textRun": {"content": text}}]}}
+
+    image = {"paragraph": {"elements": [{"inlineObjectElement": {"imageProperties": {"sourceUri": "https://i.example/a.png"}}}]}}
+    content = [paragraph("http://b.example http://a.example"), image, paragraph("http://b.example"), image]
+
+    result = GoogleDocsParser().parse_docs_json(content)
+    assert result.urls == ["http://b.example", "http://a.example"]
+    assert result.images == ["https://i.example/a.png"]
@@ -1,4 +1,8 @@
 import io
+import zipfile
+
+from docx import Document
+
 from app.services.docx_service import create_docx_from_text, parse_docx_to_text
 
 
@@ -10,3 +14,40 @@ def test_create_and_parse_docx_roundtrip():
     parsed = parse_docx_to_text(b)
     assert "Hello World" in parsed
     assert "This is a second paragraph" in parsed
+
+
+def test_parse_matches_python_docx_paragraph_text():
+    doc = Document()
+    doc.add_paragraph("tab\there")
+    paragraph = doc.add_paragraph("before")
+    paragraph.add_run().add_break()
+    paragraph.add_run("after")
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "inside table"
+    doc.add_paragraph("last")
+    bio = io.BytesIO()
+    doc.save(bio)
+
+    expected = "\n".join(p.text for p in Document(io.BytesIO(bio.getvalue())).paragraphs)
+    assert parse_docx_to_text(bio.getvalue()) == expected == "tab\there\nbefore\nafter\nlast"
+
+
+def test_create_docx_keeps_paragraph_layout():
+    data = create_docx_from_text("one\ntwo\n\nthree\n\n\n\nfour")
+    paragraphs = [p.text for p in Document(io.BytesIO(data)).paragraphs]
+    assert paragraphs == ["one", "two", "three", "", "four"]
+
+
+def test_parse_does_not_expand_external_entities(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("TOP-SECRET")
+    document_xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<!DOCTYPE w:document [<!ENTITY xxe SYSTEM "{secret.as_uri()}">]>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        "<w:body><w:p><w:r><w:t>&xxe;</w:t></w:r></w:p></w:body></w:document>"
+    )
+    bio = io.BytesIO()
+    with zipfile.ZipFile(bio, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+
+    assert "TOP-SECRET" not in parse_docx_to_text(bio.getvalue())
@@ -1,12 +1,17 @@
 import io
+import subprocess
+import sys
+import tempfile
+import threading
 from pathlib import Path
 
 import pytest
+from fastapi import UploadFile
 from fastapi.testclient import TestClient
 
 import app.routers.ffmpeg as ffmpeg_router
 from app.main import app
-from app.services.ffmpeg_service import ConversionResult, FfmpegServiceError
+from app.services.ffmpeg_service import ConversionResult, FfmpegService, FfmpegServiceError
 
 
 @pytest.fixture
@@ -86,3 +91,149 @@ def test_convert_media_failure(monkeypatch, client):
 
     assert response.status_code == 400
     assert response.json()["detail"] == "conversion failed"
+
+
+def test_format_catalog_is_cached_and_read_only(monkeypatch):
+    probe_output = " DE wav             WAV\n .E mp3             MP3\n D. flac,FLAC       FLAC\n"
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout=probe_output, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    service = FfmpegService()
+
+    formats = service.list_formats()
+    assert formats["inputs"] == ("flac", "wav")
+    assert formats["outputs"] == ("mp3", "wav")
+    assert formats["common"] == ("wav",)
+    with pytest.raises(TypeError):
+        formats["inputs"] = ()
+
+    assert service.has_output("mp3") and not service.has_output("flac")
+    assert service.has_input("flac") and not service.has_input("mp3")
+    assert service.list_formats() is formats
+    assert len(calls) == 1
+
+
+def test_write_upload_copies_large_payloads(tmp_path):
+    payload = bytes(range(256)) * 10_000  # spans several copy buffers
+    upload = UploadFile(file=io.BytesIO(payload), filename="clip.wav")
+    upload.file.read(10)
+
+    destination = FfmpegService._write_upload(upload, tmp_path, None)
+
+    assert destination == tmp_path / "source.wav"
+    assert destination.read_bytes() == payload
+
+
+def test_write_upload_copies_disk_backed_files(tmp_path):
+    source_path = tmp_path / "upload.bin"
+    source_path.write_bytes(b"x" * 3_000_000)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+
+    with source_path.open("rb") as handle:
+        destination = FfmpegService._write_upload(UploadFile(file=handle, filename="a.mp3"), workdir, None)
+
+    assert destination.read_bytes() == source_path.read_bytes()
+
+
+def test_write_upload_copies_in_memory_spooled_files(tmp_path):
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(b"spooled" * 1000)
+    spool.seek(0)
+
+    destination = FfmpegService._write_upload(UploadFile(file=spool, filename="a.mp3"), tmp_path, None)
+
+    assert destination.read_bytes() == b"spooled" * 1000
+
+
+def test_convert_upload_streams_pipeable_input_through_stdin(monkeypatch):
+    service = FfmpegService()
+    monkeypatch.setattr(service, "has_input", lambda fmt: True)
+    monkeypatch.setattr(service, "has_output", lambda fmt: True)
+    seen = {}
+    real_popen = subprocess.Popen
+
+    def fake_popen(command, **kwargs):
+        seen["command"] = command
+        # Stand-in for ffmpeg: copy stdin to the output path.
+        script = "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], 'wb'))"
+        return real_popen([sys.executable, "-c", script, command[-1]], **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", fake_popen)
+    payload = b"\x01\x02" * 700_000
+    result = service.convert_upload(
+        UploadFile(file=io.BytesIO(payload), filename="speech.raw"),
+        source_format="s16le",
+        target_format="wav",
+    )
+
+    try:
+        assert "pipe:0" in seen["command"]
+        assert result.output_path.read_bytes() == payload
+        # No temp copy of the input was written.
+        assert list(result.workdir.iterdir()) == [result.output_path]
+    finally:
+        service.cleanup_directory(result.workdir)
+
+
+def test_convert_uploads_runs_in_parallel_and_keeps_order(monkeypatch, tmp_path):
+    service = FfmpegService()
+    barrier = threading.Barrier(2, timeout=2)
+
+    def fake_convert(upload, **kwargs):
+        barrier.wait()  # only passes if both conversions are in flight together
+        workdir = tmp_path / upload.filename
+        workdir.mkdir()
+        return ConversionResult(workdir / "out.mp3", "out.mp3", "audio/mpeg", workdir)
+
+    monkeypatch.setattr(service, "convert_upload", fake_convert)
+    uploads = [UploadFile(file=io.BytesIO(b"a"), filename=name) for name in ("one", "two")]
+
+    results = service.convert_uploads(uploads, source_format=None, target_format="mp3", max_workers=2)
+
+    assert [result.workdir.name for result in results] == ["one", "two"]
+
+
+def test_probe_parses_modern_three_flag_format_table(monkeypatch):
+    probe_output = (
+        "File formats:\n"
+        " D.. = Demuxing supported\n"
+        " .E. = Muxing supported\n"
+        " ..d = Is a device\n"
+        " ---\n"
+        " D   aac             raw ADTS AAC (Advanced Audio Coding)\n"
+        "  E  mp4             MP4 (MPEG-4 Part 14)\n"
+        " DE  matroska,webm   Matroska / WebM\n"
+        " D d lavfi           Libavfilter virtual input device\n"
+    )
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda command, **kwargs: subprocess.CompletedProcess(command, 0, stdout=probe_output, stderr=""),
+    )
+
+    formats = FfmpegService().list_formats()
+
+    assert formats["inputs"] == ("aac", "lavfi", "matroska", "webm")
+    assert formats["outputs"] == ("matroska", "mp4", "webm")
+    assert formats["common"] == ("matroska", "webm")
+
+
+def test_startup_warms_format_cache(monkeypatch):
+    calls = []
+
+    def fake_list_formats():
+        calls.append(True)
+        raise FfmpegServiceError("FFmpeg is not installed or not available on the PATH.")
+
+    monkeypatch.setattr(ffmpeg_router.ffmpeg_service, "list_formats", fake_list_formats)
+
+    # A missing FFmpeg must not stop the app from starting.
+    with TestClient(app) as test_client:
+        assert test_client.get("/health").status_code == 200
+
+    assert calls == [True]
@@ -3,10 +3,14 @@ from __future__ import annotations
 import base64
 import io
 
+import numpy as np
 from fastapi.testclient import TestClient
 from PIL import Image
 
 from app.main import app
+from app.services.before_after_service import BeforeAfterService
+import app.services.halations_service as halations_module
+from app.services.halations_service import HalationsService
 
 
 def _create_image_bytes(color: tuple[int, int, int], size: tuple[int, int] = (64, 64)) -> bytes:
@@ -111,3 +115,148 @@ def test_halations_binary_metadata():
     assert response.headers["content-type"] == "image/jpeg"
     assert "X-Halations-Metadata" in response.headers
     assert "X-Halations-Hint" not in response.headers
+
+
+def test_before_after_frames_split_at_divider():
+    service = BeforeAfterService(duration_seconds=1, fps=4, cycles=1, line_thickness=2)
+    before = Image.new("RGB", (40, 10), color=(255, 0, 0))
+    after = Image.new("RGB", (40, 10), color=(0, 0, 255))
+
+    frames = [np.array(frame) for frame in service._build_frames(before, after)]
+
+    assert len(frames) == 4
+    # Frame 0 sits the divider at x=0, so the clip starts on the "after" image.
+    assert tuple(frames[0][0, -1]) == (0, 0, 255)
+    middle = frames[1]
+    divider_x = int((1 - np.cos(np.pi / 3)) / 2 * 40)
+    assert tuple(middle[0, 0]) == (255, 0, 0)
+    assert tuple(middle[0, -1]) == (0, 0, 255)
+    assert tuple(middle[0, divider_x]) == (255, 255, 255)
+
+
+def test_before_after_divider_matches_pil_line():
+    from PIL import ImageDraw
+
+    for mode in ("RGB", "RGBA"):
+        for thickness in (1, 2, 3, 6):
+            service = BeforeAfterService(line_thickness=thickness)
+            before = Image.new(mode, (40, 6), color=(200, 10, 10, 255)[: len(mode)])
+            after = Image.new(mode, (40, 6), color=(10, 10, 200, 255)[: len(mode)])
+            divider_x = 17
+
+            frame = np.concatenate((np.array(before)[:, :divider_x], np.array(after)[:, divider_x:]), axis=1)
+            service._draw_divider(frame, divider_x)
+
+            expected = Image.fromarray(frame.copy())
+            expected.paste(before.crop((0, 0, divider_x, 6)), (0, 0))
+            expected.paste(after.crop((divider_x, 0, 40, 6)), (divider_x, 0))
+            draw = ImageDraw.Draw(expected)
+            line = [(divider_x, -10), (divider_x, 16)]
+            draw.line(line, fill=(20, 20, 20, 255)[: len(mode)], width=thickness + 4)
+            draw.line(line, fill=(255, 255, 255, 255)[: len(mode)], width=thickness)
+            np.testing.assert_array_equal(frame, np.array(expected))
+
+
+def test_before_after_fast_path_matches_full_composition():
+    service = BeforeAfterService(duration_seconds=1, fps=24, cycles=2, line_thickness=3)
+    rng = np.random.default_rng(0)
+    before_arr = rng.integers(0, 255, size=(8, 50, 3), dtype=np.uint8)
+    after_arr = rng.integers(0, 255, size=(8, 50, 3), dtype=np.uint8)
+    before, after = Image.fromarray(before_arr), Image.fromarray(after_arr)
+
+    positions = service._divider_positions(24, 50).tolist()
+    for divider_x, frame in zip(positions, service._build_frames(before, after)):
+        expected = np.concatenate((before_arr[:, :divider_x], after_arr[:, divider_x:]), axis=1)
+        service._draw_divider(expected, divider_x)
+        np.testing.assert_array_equal(frame, expected)
+
+
+def test_before_after_gif_writes_changed_subrectangles():
+    service = BeforeAfterService(duration_seconds=1, fps=8, cycles=1, line_thickness=2)
+    before = Image.new("RGB", (80, 20), color=(255, 0, 0))
+    after = Image.new("RGB", (80, 20), color=(0, 0, 255))
+    palette = service._build_gif_palette(before, after)
+
+    content, content_type, _, _ = service._encode_with_gif(
+        service._build_frames(before, after), palette=palette
+    )
+
+    assert content_type == "image/gif"
+    gif = Image.open(io.BytesIO(content))
+    assert gif.n_frames > 1
+    gif.seek(1)
+    # Only the band swept by the divider is stored for later frames.
+    left, _, right, _ = gif.tile[0][1]
+    assert right - left < 80
+
+
+def test_before_after_identical_inputs_flagged():
+    service = BeforeAfterService(duration_seconds=1, fps=6, line_thickness=2)
+    image = Image.new("RGB", (40, 10), color=(0, 128, 0))
+
+    frames = [np.array(frame) for frame in service._build_frames(image, image)]
+    for divider_x, frame in zip(service._divider_positions(6, 40).tolist(), frames):
+        expected = np.array(image)
+        service._draw_divider(expected, divider_x)
+        np.testing.assert_array_equal(frame, expected)
+
+    result = service.generate(image, image.copy())
+    assert result.metadata["identical_inputs"] is True
+    other = Image.new("RGB", (40, 10), color=(0, 128, 1))
+    assert service.generate(image, other).metadata["identical_inputs"] is False
+
+
+def test_before_after_mp4_metadata_reports_encoded_size(monkeypatch):
+    service = BeforeAfterService(duration_seconds=1, fps=2)
+    monkeypatch.setattr(
+        service, "_encode_animation", lambda *args, **kwargs: (b"", "video/mp4", "mp4", "ffmpeg")
+    )
+    image = Image.new("RGB", (40, 10), color=(0, 128, 0))
+
+    metadata = service.generate(image, image, frame_size=(31, 17)).metadata
+    assert (metadata["width"], metadata["height"]) == (32, 18)
+
+    monkeypatch.setattr(
+        service, "_encode_animation", lambda *args, **kwargs: (b"", "image/gif", "gif", "gif")
+    )
+    metadata = service.generate(image, image, frame_size=(31, 17)).metadata
+    assert (metadata["width"], metadata["height"]) == (31, 17)
+
+
+def test_halations_glow_only_touches_red_channel(monkeypatch):
+    captured = {}
+
+    def capture(pixels):
+        captured["pixels"] = pixels.copy()
+        return b""
+
+    monkeypatch.setattr(HalationsService, "_encode_jpeg", staticmethod(capture))
+
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, size=(16, 24, 3), dtype=np.uint8)
+    pixels[4:10, 6:14] = 250
+    HalationsService(blur_amount=2, brightness_threshold=200, strength=40).apply(
+        Image.fromarray(pixels)
+    )
+
+    result = captured["pixels"]
+    np.testing.assert_array_equal(result[..., 1:], pixels[..., 1:])
+    # Screen blending never darkens, and the strength offset lifts every red pixel.
+    assert (result[..., 0] >= pixels[..., 0]).all()
+    assert (result[..., 0] > pixels[..., 0]).any()
+
+
+def test_halations_simplejpeg_matches_pillow_encoder_settings(monkeypatch):
+    calls = []
+
+    class FakeSimpleJpeg:
+        @staticmethod
+        def encode_jpeg(pixels, **kwargs):
+            calls.append(kwargs)
+            return b"jpeg"
+
+    monkeypatch.setattr(halations_module, "simplejpeg", FakeSimpleJpeg)
+
+    assert HalationsService._encode_jpeg(np.zeros((4, 4, 3), dtype=np.uint8)) == b"jpeg"
+    assert calls[0]["colorsubsampling"] == "420"
+    assert calls[0]["fastdct"] is False
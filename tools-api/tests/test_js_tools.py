@@ -301,6 +301,42 @@ def test_cobalt_endpoint_binary_response(client, monkeypatch):
     assert response.content == b"binary-data"
 
 
+def test_cobalt_binary_file_is_removed_after_the_response(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "COBALT_API_BASE_URL", "https://cobalt.example")
+    media = tmp_path / "clip.mp4"
+    media.write_bytes(b"binary-data")
+
+    class DummyGateway:
+        has_remote = True
+        has_local = False
+
+        async def process(self, payload: Dict[str, Any], *, expect_binary: bool, filename_override=None):
+            binary = CobaltBinaryResult(
+                path=media,
+                filename="clip.mp4",
+                content_type="video/mp4",
+                metadata={},
+                cleanup=media.unlink,
+            )
+            return CobaltProcessResult(
+                payload={},
+                binary=binary.acquire(),
+                used_local_fallback=False,
+                source_label="remote.test",
+            )
+
+    monkeypatch.setattr(js_tools_router, "_cobalt_gateway", DummyGateway())
+
+    response = client.post(
+        "/js-tools/cobalt",
+        json={"url": "https://example.com/video", "response_format": "binary"},
+    )
+
+    assert response.status_code == 200
+    assert response.content == b"binary-data"
+    assert not media.exists()
+
+
 def test_cobalt_shortcut_json_response(client, monkeypatch):
     monkeypatch.setattr(settings, "COBALT_API_BASE_URL", "https://cobalt.example")
 
@@ -381,3 +417,41 @@ def test_cobalt_shortcut_binary_response(client, monkeypatch):
     assert response.headers["X-Cobalt-Metadata"]
     assert response.headers["X-Cobalt-Backend"] == "remote"
     assert response.content == b"shortcut-media"
+
+
+def test_zip_payload_bundles_slices_and_manifest(tmp_path):
+    (tmp_path / "slice_1.jpg").write_bytes(b"\xff\xd8one")
+    (tmp_path / "slice_2.jpg").write_bytes(b"\xff\xd8two")
+
+    files = [tmp_path / "slice_1.jpg", tmp_path / "slice_2.jpg"]
+    payload = js_tool_service._create_zip_payload(files, {"slices": 2})
+
+    assert payload["content_type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(base64.b64decode(payload["base64"]))) as archive:
+        assert archive.namelist() == ["slice_1.jpg", "slice_2.jpg", "manifest.json"]
+        assert archive.read("slice_2.jpg") == b"\xff\xd8two"
+        assert json.loads(archive.read("manifest.json")) == {"slices": 2}
+        assert archive.getinfo("slice_1.jpg").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("manifest.json").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_parse_cli_output_reads_last_line():
+    payload = {
+        "mode": "standard",
+        "sliceCount": 1,
+        "sliceWidth": 1080,
+        "sliceHeight": 1350,
+        "scaledWidth": 1080,
+        "scaledHeight": 1350,
+        "slices": [{"filename": "slice_1.jpg", "width": 1080, "height": 1350}],
+        "fullView": {"filename": "full.jpg", "width": 1080, "height": 1350},
+    }
+    stdout = "loading image\nslicing 1/1\n" + json.dumps(payload) + "\n"
+
+    result = js_tool_service._parse_cli_output(stdout)
+
+    assert result.slice_count == 1
+    assert result.full_view["filename"] == "full.jpg"
+
+    with pytest.raises(js_tool_service.JavaScriptToolError):
+        js_tool_service._parse_cli_output("progress\nnot json\n")
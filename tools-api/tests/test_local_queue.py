@@ -1,8 +1,12 @@
+import threading
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
-from app.extensions import local_queue_extension
+from app.extensions import LocalQueueExtension, local_queue_extension
 from app.main import app
+from app.runtime.worker import BackgroundWorkerController
 
 
 @pytest.fixture
@@ -48,3 +52,42 @@ def test_docs_conversion_endpoints(client):
     markdown_payload = markdown_response.json()
     assert "requests" in markdown_payload
     assert isinstance(markdown_payload["requests"], list)
+
+
+def test_worker_processes_jobs_and_stops_promptly(tmp_path):
+    queue_extension = LocalQueueExtension(data_dir=tmp_path)
+    worker = BackgroundWorkerController(queue_extension, handler=lambda job: {"html": job["html"]})
+    worker.start()
+
+    job_id = queue_extension.enqueue_html("<p>Hi</p>")
+    deadline = time.monotonic() + 2
+    while queue_extension.get_job(job_id)["status"] != "finished" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert queue_extension.get_job(job_id) == {"status": "finished", "result": {"html": "<p>Hi</p>"}}
+
+    started = time.monotonic()
+    worker.stop()
+    assert time.monotonic() - started < 1
+
+
+def test_worker_pool_runs_jobs_concurrently(tmp_path):
+    queue_extension = LocalQueueExtension(data_dir=tmp_path)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def handler(job):
+        # Only completes if both jobs are in flight at the same time.
+        barrier.wait()
+        return {}
+
+    worker = BackgroundWorkerController(queue_extension, handler=handler, max_workers=2)
+    worker.start()
+    job_ids = [queue_extension.enqueue_html("<p>a</p>"), queue_extension.enqueue_html("<p>b</p>")]
+
+    deadline = time.monotonic() + 3
+    while time.monotonic() < deadline and any(
+        queue_extension.get_job(job_id)["status"] != "finished" for job_id in job_ids
+    ):
+        time.sleep(0.01)
+    worker.stop()
+
+    assert all(queue_extension.get_job(job_id)["status"] == "finished" for job_id in job_ids)
@@ -0,0 +1,40 @@
+import logging
+import threading
+
+from app.runtime.log_buffer import UILogHandler
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("tools-api", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_snapshot_and_tail_decode_buffered_entries():
+    handler = UILogHandler(max_entries=3)
+    for message in ("first", "second ✓", "third", "fourth"):
+        handler.emit(_record(message))
+
+    assert handler.snapshot() == "second ✓\nthird\nfourth"
+    assert handler.tail(2) == ["third", "fourth"]
+    assert handler.tail() == ["second ✓", "third", "fourth"]
+
+    handler.clear()
+    assert handler.snapshot() == ""
+
+
+def test_listeners_receive_batched_lines():
+    handler = UILogHandler()
+    received: list[bytes] = []
+    done = threading.Event()
+
+    def listener(batch):
+        received.extend(batch)
+        if len(received) >= 3:
+            done.set()
+
+    handler.subscribe(listener)
+    for message in ("one", "two", "three"):
+        handler.emit(_record(message))
+
+    assert done.wait(timeout=2)
+    assert received == [b"one", b"two", b"three"]
+    handler.unsubscribe(listener)
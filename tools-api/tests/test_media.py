@@ -1,5 +1,4 @@
 import base64
-import io
 import json
 import zipfile
 from pathlib import Path
@@ -21,11 +20,18 @@ def client():
 
 @pytest.fixture
 def temp_download_store(monkeypatch, tmp_path):
-    store = DownloadStore(root=tmp_path)
+    store = DownloadStore(root=tmp_path / "store")
     monkeypatch.setattr(media_router, "download_store", store)
     return store
 
 
+def _download_result(directory: Path, content: bytes, **fields) -> DownloadResult:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "payload.bin"
+    path.write_bytes(content)
+    return DownloadResult(path=path, size=len(content), **fields)
+
+
 def test_yt_dlp_metadata_endpoint(client, monkeypatch):
     sample_metadata = {
         "id": "demo",
@@ -72,13 +78,14 @@ def test_yt_dlp_metadata_endpoint(client, monkeypatch):
     assert payload["available_subtitles"]["auto"] == ["es"]
 
 
-def test_yt_dlp_download_endpoint(client, monkeypatch, temp_download_store):
+def test_yt_dlp_download_endpoint(client, monkeypatch, temp_download_store, tmp_path):
     metadata = {"id": "demo", "title": "Sample", "ext": "mp4"}
 
     def fake_download(url: str, *, options, filename_override=None):
         assert filename_override == "custom.mp4"
-        return DownloadResult(
-            content=b"video-bytes",
+        return _download_result(
+            tmp_path / "work",
+            b"video-bytes",
             filename=filename_override or "sample.mp4",
             content_type="video/mp4",
             metadata=metadata,
@@ -105,6 +112,9 @@ def test_yt_dlp_download_endpoint(client, monkeypatch, temp_download_store):
     stored_file = temp_download_store.root / file_id / "custom.mp4"
     assert stored_file.exists()
     assert stored_file.read_bytes() == b"video-bytes"
+    assert download["filesize"] == download["metadata"]["filesize"] == len(b"video-bytes")
+    # The payload is moved into the store rather than re-written from memory.
+    assert not (tmp_path / "work" / "payload.bin").exists()
 
     file_response = client.get(f"/media/yt-dlp/files/{file_id}")
     assert file_response.status_code == 200
@@ -149,13 +159,14 @@ def test_yt_dlp_accepts_urls_without_scheme(client, monkeypatch):
     assert captured["url"] == "https://youtube.com/watch?v=123"
 
 
-def test_yt_dlp_sanitises_filename_override(client, monkeypatch, temp_download_store):
+def test_yt_dlp_sanitises_filename_override(client, monkeypatch, temp_download_store, tmp_path):
     captured: dict[str, str | None] = {}
 
     def fake_download(url: str, *, options, filename_override=None):
         captured["filename"] = filename_override
-        return DownloadResult(
-            content=b"bytes",
+        return _download_result(
+            tmp_path / "work",
+            b"bytes",
             filename="video.mp4",
             content_type="video/mp4",
             metadata={"id": "demo"},
@@ -177,14 +188,15 @@ def test_yt_dlp_sanitises_filename_override(client, monkeypatch, temp_download_s
     assert captured["filename"] == "video.mp4"
 
 
-def test_yt_dlp_subtitle_download(client, monkeypatch, temp_download_store):
+def test_yt_dlp_subtitle_download(client, monkeypatch, temp_download_store, tmp_path):
     metadata = {"id": "demo", "title": "Sample"}
 
     def fake_download_subtitles(url: str, *, options, filename_override=None):
         assert options["subtitleslangs"] == ["en"]
         assert options["writeautomaticsub"] is True
-        return DownloadResult(
-            content=b"subtitle-bytes",
+        return _download_result(
+            tmp_path / "work",
+            b"subtitle-bytes",
             filename=filename_override or "sample.vtt",
             content_type="text/vtt",
             metadata=metadata,
@@ -280,9 +292,35 @@ def test_download_subtitles_packages_multiple_languages(monkeypatch):
     assert result.filename == "subtitles.zip"
     assert sorted(result.metadata["subtitle_files"]) == ["video.en.vtt", "video.fr.srt"]
 
-    with zipfile.ZipFile(io.BytesIO(result.content)) as archive:
+    with result, zipfile.ZipFile(result.path) as archive:
+        assert result.size == result.path.stat().st_size
         assert sorted(archive.namelist()) == ["video.en.vtt", "video.fr.srt"]
         assert archive.read("video.en.vtt") == b"English"
         assert archive.read("video.fr.srt") == "Français".encode("utf-8")
 
+    # Closing the result removes the temporary directory holding the archive.
+    assert not result.path.parent.exists()
+
+
+def test_download_store_retrieves_recorded_content_file(tmp_path):
+    store = DownloadStore(root=tmp_path)
+    stored = store.store(
+        filename="clip.mp4",
+        content=b"data",
+        content_type="video/mp4",
+        metadata={"content_type": "video/mp4", "filename": "clip.mp4"},
+    )
+    # Stray files next to the content must not be picked up.
+    (stored.path.parent / "aaa.part").write_bytes(b"partial")
+
+    retrieved = store.retrieve(stored.file_id)
+    assert retrieved.path == stored.path
+    assert DownloadStore.CONTENT_FILE_KEY not in retrieved.metadata
+
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / "old.bin").write_bytes(b"old")
+    assert store.retrieve("legacy").path == legacy_dir / "old.bin"
 
+    with pytest.raises(FileNotFoundError):
+        store.retrieve("missing")
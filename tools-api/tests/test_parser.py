@@ -15,3 +15,145 @@ async def test_parse_markdown():
     result = await parser_service.parse_markdown(md)
     assert isinstance(result, list)
     assert "insertText" in result[0]
+
+
+def test_parse_color_returns_fresh_dicts():
+    parser = parser_service.RichTextParser()
+
+    first = parser._parse_color("#ff0000")
+    first["color"]["rgbColor"]["red"] = 0
+
+    assert parser._parse_color("#ff0000") == {"color": {"rgbColor": {"red": 1.0, "green": 0.0, "blue": 0.0}}}
+    assert parser._parse_color("Grey") == {"color": {"rgbColor": {"red": 0.5, "green": 0.5, "blue": 0.5}}}
+    assert parser._parse_color("rgba(0, 51, 255, 0.5)")["color"]["rgbColor"]["green"] == 0.2
+    assert parser._parse_color("#zzz") is None
+
+
+def test_parse_html_coalesces_runs_with_the_same_style():
+    requests = parser_service.parse_html_to_docs_sync("<p><b>one</b><b> two</b> three</p>")
+
+    assert requests == [
+        {"insertText": {"location": {"index": 1}, "text": "one two"}},
+        {
+            "updateTextStyle": {
+                "range": {"startIndex": 1, "endIndex": 8},
+                "textStyle": {"bold": True},
+                "fields": "bold",
+            }
+        },
+        {"insertText": {"location": {"index": 8}, "text": " three\n"}},
+    ]
+
+
+def test_parse_html_table_counts_rows_inside_tbody():
+    html = "<table><tbody><tr><td>1</td><th>2</th></tr><tr><td>3</td></tr></tbody></table>"
+
+    requests = parser_service.parse_html_to_docs_sync(html)
+
+    assert {"insertTable": {"rows": 2, "columns": 2, "location": {"index": 1}}} in requests
+
+
+def test_parse_markdown_reuses_converter_without_leaking_state():
+    with_footnote = parser_service.parse_markdown_to_docs_sync("Text[^1]\n\n[^1]: The note")
+    plain = parser_service.parse_markdown_to_docs_sync("Text")
+
+    assert any("The note" in r.get("insertText", {}).get("text", "") for r in with_footnote)
+    assert not any("The note" in r.get("insertText", {}).get("text", "") for r in plain)
+    assert parser_service._get_markdown() is parser_service._get_markdown()
+
+
+def test_identical_styles_are_interned():
+    parser = parser_service.RichTextParser()
+    requests = parser.parse_html(
+        '<p><span style="color: red; font-size: 12pt">a</span> <i>x</i> '
+        '<span style="font-size: 12pt; color: red">b</span></p>'
+    )
+
+    styles = [r["updateTextStyle"]["textStyle"] for r in requests if "updateTextStyle" in r]
+    assert len(styles) == 3
+    assert styles[0] is styles[2]
+    assert styles[0] is not styles[1]
+
+
+def test_parse_html_handles_deeply_nested_markup():
+    html = "<p>" + "<span>" * 1500 + "deep" + "</span>" * 1500 + "</p>"
+
+    requests = parser_service.parse_html_to_docs_sync(html)
+
+    assert requests == [{"insertText": {"location": {"index": 1}, "text": "deep\n"}}]
+
+
+def test_cached_parse_returns_independent_results():
+    first = parser_service.parse_html_to_docs_sync("<p><b>cached</b></p>")
+    first[1]["updateTextStyle"]["textStyle"]["bold"] = False
+    first.append({"bogus": True})
+
+    second = parser_service.parse_html_to_docs_sync("<p><b>cached</b></p>")
+
+    assert len(second) == 2
+    assert second[1]["updateTextStyle"]["textStyle"] == {"bold": True}
+    assert parser_service._parse_html_cached.cache_info().hits >= 1
+
+
+def test_nested_inline_markup_emits_one_styled_run():
+    requests = parser_service.parse_html_to_docs_sync("<p><b><i><u>word</u></i></b><b><i><u> more</u></i></b></p>")
+
+    assert requests == [
+        {"insertText": {"location": {"index": 1}, "text": "word more\n"}},
+        {
+            "updateTextStyle": {
+                "range": {"startIndex": 1, "endIndex": 10},
+                "textStyle": {"bold": True, "italic": True, "underline": True},
+                "fields": "bold,italic,underline",
+            }
+        },
+    ]
+
+
+def test_plain_tags_reuse_canonical_styles_per_parser():
+    first = parser_service.RichTextParser()
+    second = parser_service.RichTextParser()
+    html = "<p><b>one</b> <i>x</i> <strong>two</strong></p>"
+
+    styles = [r["updateTextStyle"]["textStyle"] for r in first.parse_html(html) if "updateTextStyle" in r]
+
+    assert styles[0] is styles[2] is first._tag_styles["b"]
+    assert first._tag_styles["b"] is not second._tag_styles["b"]
+
+
+@pytest.mark.parametrize(
+    "html, text",
+    [
+        ("<p>x<div>inner</div>y</p>", "xinner\ny\n"),
+        ("<p>a<ul><li>i</li></ul>tail</p>", "ai\ntail\n"),
+        ("<p>a<table><tr><td>c</td></tr></table>tail</p>", "a\ntail\n"),
+        ("<p>a<h2>h</h2>tail</p>", "ah\ntail\n"),
+        ("<p>a<hr>tail</p>", "a___\ntail\n"),
+        ("<b>a<p>b</p>c</b>", "ab\nc"),
+    ],
+)
+def test_parse_html_keeps_text_after_nested_blocks(html, text):
+    requests = parser_service.parse_html_to_docs_sync(html)
+
+    assert "".join(r["insertText"]["text"] for r in requests if "insertText" in r) == text
+
+
+@pytest.mark.parametrize(
+    "html, text",
+    [
+        ("<blockquote><p>q <i>it</i></p></blockquote>", "q it\n"),
+        ("<div><p>plain <b>bold</b></p></div>", "plain bold\n"),
+        ("<h2><p>title <b>bold</b></p></h2>", "title bold\n"),
+    ],
+)
+def test_parse_html_does_not_double_newline_after_styled_last_run(html, text):
+    requests = parser_service.parse_html_to_docs_sync(html)
+
+    assert "".join(r["insertText"]["text"] for r in requests if "insertText" in r) == text
+
+
+def test_parse_markdown_blockquote_with_emphasis_ends_once():
+    requests = parser_service.parse_markdown_to_docs_sync("> Quoted *emphasis*\n\nAfter.")
+
+    text = "".join(r["insertText"]["text"] for r in requests if "insertText" in r)
+    assert text == "Quoted emphasis\nAfter.\n"
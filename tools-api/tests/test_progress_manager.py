@@ -0,0 +1,49 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.services.progress_manager import ProgressManager
+
+
+@pytest.mark.asyncio
+async def test_publish_from_worker_thread_reaches_listener():
+    manager = ProgressManager()
+    channel = manager.ensure_channel("job-1")
+    assert manager.ensure_channel("job-1") is channel
+
+    def worker():
+        for step in range(3):
+            manager.publish("job-1", {"step": step})
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+
+    events = []
+    async for event in manager.iter_events("job-1"):
+        events.append(event)
+        if len(events) == 3:
+            manager.close("job-1")
+    thread.join()
+
+    assert events == [{"step": 0}, {"step": 1}, {"step": 2}]
+
+
+@pytest.mark.asyncio
+async def test_publish_without_channel_is_dropped():
+    manager = ProgressManager()
+
+    manager.publish("missing", {"step": 1})
+    manager.close("missing")
+    await asyncio.sleep(0)
+
+    assert manager._channels == {}
+
+
+def test_format_sse_encodes_utf8_frame():
+    frame = ProgressManager.format_sse({"status": "téléchargement", "percent": 50})
+
+    assert frame.startswith(b"data: ")
+    assert frame.endswith(b"\n\n")
+    assert json.loads(frame[len(b"data: "):]) == {"status": "téléchargement", "percent": 50}